@@ -34,36 +34,61 @@ Usage:
     })
 """
 
-from .workflow import (
-    run_compliance_check,
-    create_foundry_agents,
-    cleanup_foundry_agents,
-    list_foundry_agents,
-    Finding,
-    AgentResult,
-    ComplianceReport,
-    Severity,
-    Confidence,
-)
+from importlib import import_module
+
+# Public names are resolved on first access (PEP 562) so that importing one
+# name does not load both workflow.py and tools.py up front.
+_LAZY_ATTRS = {
+    # Workflow functions and data models
+    "run_compliance_check": ".workflow",
+    "run_compliance_check_batch": ".workflow",
+    "create_foundry_agents": ".workflow",
+    "cleanup_foundry_agents": ".workflow",
+    "list_foundry_agents": ".workflow",
+    "Finding": ".workflow",
+    "AgentResult": ".workflow",
+    "ComplianceReport": ".workflow",
+    "DeclarationBatch": ".workflow",
+    "Severity": ".workflow",
+    "Confidence": ".workflow",
+    
+    # Services init, tool functions and tool collections
+    "initialize_services": ".tools",
+    "services_initialized": ".tools",
+    "clear_tool_caches": ".tools",
+    "begin_run": ".tools",
+    "lookup_hs_code": ".tools",
+    "search_hs_codes_by_description": ".tools",
+    "validate_hs_code_format": ".tools",
+    "find_similar_hs_codes": ".tools",
+    "search_sanctions_by_name": ".tools",
+    "search_sanctions_by_country": ".tools",
+    "check_entity_sanctions": ".tools",
+    "check_entities_batch": ".tools",
+    "get_sanctions_regimes": ".tools",
+    "HS_CODE_TOOLS": ".tools",
+    "SANCTIONS_TOOLS": ".tools",
+    "ALL_TOOLS": ".tools",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
-from .tools import (
-    initialize_services,
-    lookup_hs_code,
-    search_hs_codes_by_description,
-    validate_hs_code_format,
-    find_similar_hs_codes,
-    search_sanctions_by_name,
-    search_sanctions_by_country,
-    check_entity_sanctions,
-    get_sanctions_regimes,
-    HS_CODE_TOOLS,
-    SANCTIONS_TOOLS,
-    ALL_TOOLS,
-)
 
 __all__ = [
     # Workflow functions
     "run_compliance_check",
+    "run_compliance_check_batch",
     "create_foundry_agents",
     "cleanup_foundry_agents",
     "list_foundry_agents",
@@ -72,11 +97,15 @@ __all__ = [
     "Finding",
     "AgentResult",
     "ComplianceReport",
+    "DeclarationBatch",
     "Severity",
     "Confidence",
     
     # Services init
     "initialize_services",
+    "services_initialized",
+    "clear_tool_caches",
+    "begin_run",
     
     # Tool functions
     "lookup_hs_code",
@@ -86,6 +115,7 @@ __all__ = [
     "search_sanctions_by_name",
     "search_sanctions_by_country",
     "check_entity_sanctions",
+    "check_entities_batch",
     "get_sanctions_regimes",
     
     # Tool collections
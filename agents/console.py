@@ -0,0 +1,66 @@
+"""
+Console Helpers
+
+Shared by the interactive entry points (container.py and test_local.py):
+JSON parsing with the optional orjson speedup and non-blocking line input.
+"""
+
+import asyncio
+import sys
+import threading
+
+try:
+    from orjson import JSONDecodeError, loads as json_loads
+except ImportError:  # orjson is an optional speedup
+    from json import JSONDecodeError, loads as json_loads
+
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:  # prompt_toolkit is optional (adds line history)
+    PromptSession = None
+
+__all__ = ['JSONDecodeError', 'json_loads', 'ainput']
+
+
+_PROMPT_SESSION = None
+
+
+def _resolve(future: asyncio.Future, line: str = None, error: BaseException = None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(line)
+
+
+async def ainput(prompt: str = "") -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+    
+    Without prompt_toolkit (or when stdin is not a terminal) the blocking
+    read runs on a daemon thread rather than the default executor, so a
+    Ctrl-C at the prompt does not leave asyncio.run() waiting on stdin
+    during shutdown.
+    """
+    global _PROMPT_SESSION
+    if PromptSession is not None and sys.stdin.isatty():
+        if _PROMPT_SESSION is None:
+            _PROMPT_SESSION = PromptSession()
+        return await _PROMPT_SESSION.prompt_async(prompt)
+    
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def read() -> None:
+        try:
+            args = (input(prompt),)
+        except BaseException as e:  # EOFError/KeyboardInterrupt go to the awaiting task
+            args = (None, e)
+        try:
+            loop.call_soon_threadsafe(_resolve, future, *args)
+        except RuntimeError:  # the loop already closed (e.g. after Ctrl-C)
+            pass
+    
+    threading.Thread(target=read, name='console-input', daemon=True).start()
+    return await future
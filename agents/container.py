@@ -14,10 +14,17 @@ import sys
 from typing import Any
 
 from agent_framework import ChatMessage, Role
-from agent_framework.azure import AzureAIClient
+from agent_framework.azure import AzureAIClient, AzureOpenAIChatClient
 from agent_framework.observability import setup_observability
-from azure.identity import DefaultAzureCredential
+from azure.identity.aio import DefaultAzureCredential, get_bearer_token_provider
 from dotenv import load_dotenv
+import httpx
+from openai import AsyncAzureOpenAI
+
+try:
+    import uvloop
+except ImportError:  # uvloop is an optional speedup (not available on Windows)
+    uvloop = None
 
 # Add paths
 sys.path.insert(0, os.path.dirname(__file__))
@@ -27,9 +34,13 @@ from workflow import (
     create_compliance_workflow,
     Declaration,
     ComplianceReport,
+    close_foundry_clients,
     run_compliance_check,
 )
+from console import JSONDecodeError, ainput, json_loads
 from tools import initialize_services
+from app.services.hs_code_reference import HSCodeReferenceService
+from app.services.sanctions_reference import SanctionsReferenceService
 
 # Load environment
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'backend', '.env'))
@@ -41,6 +52,52 @@ MODEL_DEPLOYMENT = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME") or os.getenv("AZU
 # Setup observability
 setup_observability(vs_code_extension_port=4319)
 
+# Shared credential - lives as long as the process so its in-memory token
+# cache is reused across requests. Interactive/IDE sources are excluded to
+# avoid failed probes in the credential chain; set AZURE_CLIENT_ID to pin a
+# user-assigned managed identity.
+_CREDENTIAL = DefaultAzureCredential(
+    exclude_visual_studio_code_credential=True,
+    managed_identity_client_id=os.getenv("AZURE_CLIENT_ID"),
+)
+
+# Pooled HTTP client settings for the chat client. HTTP/2 is used when the
+# optional h2 package is installed (pip install "httpx[http2]").
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=256,
+    max_keepalive_connections=64,
+    keepalive_expiry=90.0,
+)
+_COGNITIVE_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client kept open for the container lifetime."""
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(http2=http2, limits=_HTTP_LIMITS)
+
+
+def _create_chat_client(http_client: httpx.AsyncClient) -> AzureOpenAIChatClient:
+    """Create the chat client on top of the shared HTTP connection pool."""
+    openai_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    if not openai_endpoint:
+        return AzureOpenAIChatClient(credential=_CREDENTIAL)
+    
+    async_client = AsyncAzureOpenAI(
+        azure_endpoint=openai_endpoint,
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21"),
+        azure_ad_token_provider=get_bearer_token_provider(_CREDENTIAL, _COGNITIVE_SCOPE),
+        http_client=http_client,
+    )
+    return AzureOpenAIChatClient(async_client=async_client)
+
+
+# Inputs that end the interactive session
+_QUIT_COMMANDS = frozenset({'quit', 'exit', 'q'})
 
 async def run_container_agent():
     """
@@ -56,23 +113,20 @@ async def run_container_agent():
     print()
     
     # Initialize services
-    from app.services.hs_code_reference import HSCodeReferenceService
-    from app.services.sanctions_reference import SanctionsReferenceService
-    
     hs_service = HSCodeReferenceService()
     sanctions_service = SanctionsReferenceService()
     initialize_services(hs_service, sanctions_service)
     
     # Create the Azure AI client
-    async with DefaultAzureCredential() as credential:
+    http_client = _create_http_client()
+    try:
         async with AzureAIClient(
             project_endpoint=ENDPOINT,
             model_deployment_name=MODEL_DEPLOYMENT,
-            credential=credential,
+            credential=_CREDENTIAL,
         ) as ai_client:
             # Create the workflow as an agent
-            from agent_framework.azure import AzureOpenAIChatClient
-            chat_client = AzureOpenAIChatClient(credential=credential)
+            chat_client = _create_chat_client(http_client)
             
             workflow = create_compliance_workflow(chat_client)
             
@@ -91,17 +145,16 @@ async def run_container_agent():
             
             while True:
                 try:
-                    user_input = input("\nEnter declaration JSON (or 'quit' to exit): ").strip()
+                    user_input = (await ainput("\nEnter declaration JSON (or 'quit' to exit): ")).strip()
                     
-                    if user_input.lower() in ['quit', 'exit', 'q']:
+                    if user_input.lower() in _QUIT_COMMANDS:
                         break
                     
                     if not user_input:
                         continue
                     
                     # Parse declaration
-                    import json
-                    declaration_data = json.loads(user_input)
+                    declaration_data = json_loads(user_input)
                     
                     # Run compliance check
                     report = await run_compliance_check(declaration_data)
@@ -113,15 +166,20 @@ async def run_container_agent():
                     print(f"Manual Review Required: {report.requires_manual_review}")
                     print("=" * 50)
                     
-                except json.JSONDecodeError as e:
+                except JSONDecodeError as e:
                     print(f"Invalid JSON: {e}")
                 except KeyboardInterrupt:
                     break
                 except Exception as e:
                     print(f"Error: {e}")
+    finally:
+        await close_foundry_clients()
+        await http_client.aclose()
+        await _CREDENTIAL.close()
     
     print("\nAgent shutdown complete.")
 
 
 if __name__ == "__main__":
-    asyncio.run(run_container_agent())
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        runner.run(run_container_agent())
@@ -15,10 +15,16 @@ Examples:
 
 import asyncio
 import argparse
-import json
+import io
 import os
 import sys
-from datetime import datetime, timedelta
+import traceback
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from time import perf_counter
+from typing import Optional, TextIO
 
 # Add paths
 sys.path.insert(0, os.path.dirname(__file__))
@@ -29,289 +35,120 @@ from dotenv import load_dotenv
 # Load environment
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'backend', '.env'))
 
+# Imported after the environment is loaded (app.config reads it at import)
+from app.services.hs_code_reference import HSCodeReferenceService
+from app.services.sanctions_reference import SanctionsReferenceService
+from console import JSONDecodeError, ainput, json_loads
+from tools import initialize_services
+from workflow import close_foundry_clients, run_compliance_check
+
+
+# Console icons for severities and risk levels
+_SEV_ICON = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}
+_SEV_UPPER = {k: k.upper() for k in ("critical", "high", "medium", "low", "info")}
+
+# Inputs that end interactive mode
+_QUIT_COMMANDS = frozenset({'quit', 'exit', 'q'})
+
+# Maximum number of sample declarations analyzed at the same time
+MAX_CONCURRENT_TESTS = int(os.getenv("COMPLIANCE_TEST_CONCURRENCY", "4"))
+
+# Sample declarations for testing (see samples.json)
+SAMPLES_FILE = os.path.join(os.path.dirname(__file__), 'samples.json')
+
+
+def _trunc(text: str, limit: int) -> str:
+    """Shorten text to limit characters, adding '...' only when cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
 
-# Sample declarations for testing
-SAMPLE_DECLARATIONS = {
-    "basic": {
-        "name": "Basic Electronics Import",
-        "data": {
-            "declaration_id": "TEST-001",
-            "shipper": {
-                "name": "Acme Electronics Ltd",
-                "address": "123 Industrial Way, Shenzhen, China",
-                "country": "CN"
-            },
-            "consignee": {
-                "name": "UK Tech Distributors",
-                "address": "45 Commerce Park, Manchester, UK",
-                "country": "GB"
-            },
-            "goods": [
-                {
-                    "description": "Wireless Bluetooth Headphones",
-                    "hs_code": "8518300000",
-                    "quantity": 5000,
-                    "unit_value": 12.50,
-                    "total_value": 62500.00,
-                    "currency": "USD",
-                    "country_of_origin": "CN"
-                }
-            ],
-            "country_of_dispatch": "CN",
-            "port_of_entry": "Felixstowe",
-            "total_value": 62500.00,
-            "currency": "USD",
-            "transport_mode": "Sea",
-            "container_number": "MSKU1234567"
-        }
-    },
-    
-    "suspicious_origin": {
-        "name": "Suspicious Origin Mismatch",
-        "data": {
-            "declaration_id": "TEST-002",
-            "shipper": {
-                "name": "Global Trade FZE",
-                "address": "Jebel Ali Free Zone, Dubai",
-                "country": "AE"
-            },
-            "consignee": {
-                "name": "London Import Co",
-                "address": "100 Docklands, London, UK",
-                "country": "GB"
-            },
-            "goods": [
-                {
-                    "description": "Steel Pipes",
-                    "hs_code": "7304000000",
-                    "quantity": 1000,
-                    "unit_value": 45.00,
-                    "total_value": 45000.00,
-                    "currency": "USD",
-                    "country_of_origin": "RU"  # Russian origin through UAE
-                }
-            ],
-            "country_of_dispatch": "AE",
-            "port_of_entry": "Southampton",
-            "total_value": 45000.00,
-            "currency": "USD",
-            "transport_mode": "Sea"
-        }
-    },
-    
-    "potential_sanctions": {
-        "name": "Potential Sanctions Concern",
-        "data": {
-            "declaration_id": "TEST-003",
-            "shipper": {
-                "name": "Petrov Industrial Supplies",
-                "address": "45 Nevsky Prospekt, Moscow",
-                "country": "RU"
-            },
-            "consignee": {
-                "name": "Northern Engineering Ltd",
-                "address": "Edinburgh, Scotland, UK",
-                "country": "GB"
-            },
-            "goods": [
-                {
-                    "description": "Industrial Ball Bearings",
-                    "hs_code": "8482100000",
-                    "quantity": 10000,
-                    "unit_value": 5.00,
-                    "total_value": 50000.00,
-                    "currency": "USD",
-                    "country_of_origin": "RU"
-                }
-            ],
-            "country_of_dispatch": "RU",
-            "port_of_entry": "Hull",
-            "total_value": 50000.00,
-            "currency": "USD",
-            "transport_mode": "Sea"
-        }
-    },
-    
-    "dual_use": {
-        "name": "Potential Dual-Use Goods",
-        "data": {
-            "declaration_id": "TEST-004",
-            "shipper": {
-                "name": "Precision Tech GmbH",
-                "address": "Munich, Germany",
-                "country": "DE"
-            },
-            "consignee": {
-                "name": "Defense Research Ltd",
-                "address": "Bristol, UK",
-                "country": "GB"
-            },
-            "goods": [
-                {
-                    "description": "High-precision CNC milling machine, 5-axis",
-                    "hs_code": "8459610000",
-                    "quantity": 1,
-                    "unit_value": 250000.00,
-                    "total_value": 250000.00,
-                    "currency": "EUR",
-                    "country_of_origin": "DE"
-                },
-                {
-                    "description": "Thermal imaging camera modules",
-                    "hs_code": "9013801000",
-                    "quantity": 50,
-                    "unit_value": 2000.00,
-                    "total_value": 100000.00,
-                    "currency": "EUR",
-                    "country_of_origin": "DE"
-                }
-            ],
-            "country_of_dispatch": "DE",
-            "port_of_entry": "Southampton",
-            "total_value": 350000.00,
-            "currency": "EUR",
-            "transport_mode": "Road"
-        }
-    },
-    
-    "undervaluation": {
-        "name": "Suspected Undervaluation",
-        "data": {
-            "declaration_id": "TEST-005",
-            "shipper": {
-                "name": "Budget Electronics Co",
-                "address": "Guangzhou, China",
-                "country": "CN"
-            },
-            "consignee": {
-                "name": "Discount Gadgets UK",
-                "address": "Birmingham, UK",
-                "country": "GB"
-            },
-            "goods": [
-                {
-                    "description": "Apple iPhone 15 Pro Max smartphones",
-                    "hs_code": "8517130000",
-                    "quantity": 1000,
-                    "unit_value": 50.00,  # Suspiciously low for iPhone 15 Pro Max
-                    "total_value": 50000.00,
-                    "currency": "USD",
-                    "country_of_origin": "CN"
-                }
-            ],
-            "country_of_dispatch": "CN",
-            "port_of_entry": "Heathrow",
-            "total_value": 50000.00,
-            "currency": "USD",
-            "transport_mode": "Air"
-        }
-    },
-    
-    "inconsistent": {
-        "name": "Inconsistent Declaration",
-        "data": {
-            "declaration_id": "TEST-006",
-            "shipper": {
-                "name": "FastShip Logistics",
-                "address": "Hong Kong",
-                "country": "HK"
-            },
-            "consignee": {
-                "name": "UK Wholesale Ltd",
-                "address": "Leeds, UK",
-                "country": "GB"
-            },
-            "goods": [
-                {
-                    "description": "Fresh frozen seafood - salmon fillets",  # Fresh AND frozen?
-                    "hs_code": "0302140000",  # Fresh fish code
-                    "quantity": 500,
-                    "unit_value": 25.00,
-                    "total_value": 12000.00,  # Doesn't match 500 x 25
-                    "currency": "GBP",
-                    "country_of_origin": "NO"  # Norway origin from Hong Kong?
-                }
-            ],
-            "country_of_dispatch": "HK",
-            "port_of_entry": "Felixstowe",
-            "total_value": 15000.00,  # Different from goods total
-            "currency": "USD",  # Different currency than goods
-            "transport_mode": "Air"  # Air freight for frozen seafood from HK?
-        }
-    }
-}
 
+@lru_cache(maxsize=1)
+def _samples() -> dict:
+    """Load the sample declarations, parsing the file once on first use."""
+    with open(SAMPLES_FILE, 'rb') as f:
+        return json_loads(f.read())
 
-async def run_test(sample_name: str, declaration_data: dict):
-    """Run a single test with the compliance workflow."""
-    from workflow import run_compliance_check
-    from tools import initialize_services
+
+async def run_test(sample_name: str, declaration_data: dict, out: Optional[TextIO] = None):
+    """Run a single test with the compliance workflow.
     
-    print(f"\n{'=' * 70}")
-    print(f"Testing: {sample_name}")
-    print(f"{'=' * 70}")
-    print(f"\nDeclaration ID: {declaration_data.get('declaration_id', 'N/A')}")
+    Output goes to ``out`` (default stdout) so concurrent runs can buffer it.
+    Each section is collected into a list and written in a single call.
+    """
+    out = out or sys.stdout
+    lines: list[str] = [
+        f"\n{'=' * 70}",
+        f"Testing: {sample_name}",
+        f"{'=' * 70}",
+        f"\nDeclaration ID: {declaration_data.get('declaration_id', 'N/A')}",
+    ]
     
     # Show key details
-    if 'shipper' in declaration_data:
-        print(f"Shipper: {declaration_data['shipper'].get('name', 'Unknown')} ({declaration_data['shipper'].get('country', '?')})")
-    if 'consignee' in declaration_data:
-        print(f"Consignee: {declaration_data['consignee'].get('name', 'Unknown')}")
-    if 'goods' in declaration_data:
-        print(f"Goods: {len(declaration_data['goods'])} item(s)")
-        for i, good in enumerate(declaration_data['goods'][:3], 1):
-            print(f"  {i}. {good.get('description', 'Unknown')[:50]} (HS: {good.get('hs_code', '?')})")
-    print(f"Total Value: {declaration_data.get('total_value', '?')} {declaration_data.get('currency', '?')}")
+    shipper = declaration_data.get('shipper')
+    consignee = declaration_data.get('consignee')
+    goods = declaration_data.get('goods')
+    if shipper is not None:
+        lines.append(f"Shipper: {shipper.get('name', 'Unknown')} ({shipper.get('country', '?')})")
+    if consignee is not None:
+        lines.append(f"Consignee: {consignee.get('name', 'Unknown')}")
+    if goods is not None:
+        lines.append(f"Goods: {len(goods)} item(s)")
+        for i, good in enumerate(islice(goods, 3), 1):
+            lines.append(f"  {i}. {good.get('description', 'Unknown')[:50]} (HS: {good.get('hs_code', '?')})")
+    lines.append(f"Total Value: {declaration_data.get('total_value', '?')} {declaration_data.get('currency', '?')}")
     
-    print("\nRunning compliance analysis...")
-    start_time = datetime.now()
+    lines.append("\nRunning compliance analysis...")
+    out.write("\n".join(lines) + "\n")
+    lines.clear()
+    start = perf_counter()
     
     try:
         # Run the compliance check
         report = await run_compliance_check(declaration_data)
         
-        elapsed = (datetime.now() - start_time).total_seconds()
+        elapsed = perf_counter() - start
         
         # Display results
-        print(f"\n{'─' * 50}")
-        print(f"COMPLIANCE REPORT")
-        print(f"{'─' * 50}")
-        print(f"Overall Risk: {report.overall_risk.upper()}")
-        print(f"Total Findings: {report.total_findings}")
-        print(f"Manual Review Required: {'YES' if report.requires_manual_review else 'No'}")
-        print(f"Processing Time: {elapsed:.2f}s")
+        lines.extend((
+            f"\n{'─' * 50}",
+            "COMPLIANCE REPORT",
+            f"{'─' * 50}",
+            f"Overall Risk: {_SEV_UPPER.get(report.overall_risk) or report.overall_risk.upper()}",
+            f"Total Findings: {report.total_findings}",
+            f"Manual Review Required: {'YES' if report.requires_manual_review else 'No'}",
+            f"Processing Time: {elapsed:.2f}s",
+        ))
         
         # Show findings by severity
-        if report.findings:
-            print(f"\nFindings by Agent:")
-            by_agent = {}
-            for finding in report.findings:
-                agent = finding.agent_name
-                if agent not in by_agent:
-                    by_agent[agent] = []
-                by_agent[agent].append(finding)
+        if report.total_findings:
+            lines.append(f"\nFindings by Agent:")
+            by_agent = defaultdict(list)
+            for result in report.agent_results:
+                for finding in result.findings:
+                    by_agent[finding.agent].append(finding)
             
             for agent, findings in by_agent.items():
-                print(f"\n  [{agent}]")
+                lines.append(f"\n  [{agent}]")
                 for f in findings[:5]:  # Show first 5 per agent
-                    severity_icon = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}.get(f.severity, "⚪")
-                    print(f"    {severity_icon} {f.severity.upper()}: {f.summary[:60]}...")
+                    severity_icon = _SEV_ICON.get(f.severity, "⚪")
+                    severity = _SEV_UPPER.get(f.severity) or f.severity.upper()
+                    lines.append(f"    {severity_icon} {severity}: {_trunc(f.title, 60)}")
                 if len(findings) > 5:
-                    print(f"    ... and {len(findings) - 5} more")
+                    lines.append(f"    ... and {len(findings) - 5} more")
         
         # Show recommendations
         if report.recommendations:
-            print(f"\nRecommendations:")
+            lines.append(f"\nRecommendations:")
             for i, rec in enumerate(report.recommendations[:5], 1):
-                print(f"  {i}. {rec[:70]}...")
+                lines.append(f"  {i}. {_trunc(rec, 70)}")
         
+        out.write("\n".join(lines) + "\n")
         return report
         
     except Exception as e:
-        elapsed = (datetime.now() - start_time).total_seconds()
-        print(f"\n❌ ERROR after {elapsed:.2f}s: {e}")
-        import traceback
-        traceback.print_exc()
+        elapsed = perf_counter() - start
+        out.write(f"\n❌ ERROR after {elapsed:.2f}s: {e}\n")
+        traceback.print_exc(file=out)
         return None
 
 
@@ -321,15 +158,10 @@ async def run_all_tests():
     print("COMPLIANCE WORKFLOW TEST SUITE")
     print("=" * 70)
     print(f"Starting at: {datetime.now().isoformat()}")
-    print(f"Number of samples: {len(SAMPLE_DECLARATIONS)}")
+    print(f"Number of samples: {len(_samples())}")
     
     # Initialize services once
-    from tools import initialize_services
-    
     try:
-        from app.services.hs_code_reference import HSCodeReferenceService
-        from app.services.sanctions_reference import SanctionsReferenceService
-        
         hs_service = HSCodeReferenceService()
         sanctions_service = SanctionsReferenceService()
         initialize_services(hs_service, sanctions_service)
@@ -338,9 +170,23 @@ async def run_all_tests():
         print(f"⚠ Warning: Could not initialize reference services: {e}")
         print("  Tests will run with limited functionality")
     
+    # Samples are independent and dominated by agent network latency, so run
+    # them concurrently (bounded to respect service rate limits). Each run
+    # writes to its own buffer, flushed in order once all have finished.
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+    
+    async def _bounded(sample: dict) -> tuple:
+        buffer = io.StringIO()
+        async with semaphore:
+            result = await run_test(sample["name"], sample["data"], out=buffer)
+        return result, buffer
+    
+    samples = _samples()
+    outcomes = await asyncio.gather(*(_bounded(sample) for sample in samples.values()))
+    
     results = {}
-    for sample_key, sample in SAMPLE_DECLARATIONS.items():
-        result = await run_test(sample["name"], sample["data"])
+    for sample_key, (result, buffer) in zip(samples, outcomes):
+        sys.stdout.write(buffer.getvalue())
         results[sample_key] = result
     
     # Summary
@@ -354,22 +200,15 @@ async def run_all_tests():
     print(f"Failed: {len(results) - passed}")
     
     print("\nRisk Distribution:")
-    risk_counts = {}
-    for key, result in results.items():
-        if result:
-            risk = result.overall_risk
-            risk_counts[risk] = risk_counts.get(risk, 0) + 1
+    risk_counts = Counter(r.overall_risk for r in results.values() if r)
     
     for risk, count in sorted(risk_counts.items()):
-        icon = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}.get(risk, "⚪")
+        icon = _SEV_ICON.get(risk, "⚪")
         print(f"  {icon} {risk.upper()}: {count}")
 
 
 async def interactive_mode():
     """Run in interactive mode."""
-    from tools import initialize_services
-    from workflow import run_compliance_check
-    
     print("=" * 70)
     print("COMPLIANCE WORKFLOW - INTERACTIVE MODE")
     print("=" * 70)
@@ -381,9 +220,6 @@ async def interactive_mode():
     
     # Initialize services
     try:
-        from app.services.hs_code_reference import HSCodeReferenceService
-        from app.services.sanctions_reference import SanctionsReferenceService
-        
         hs_service = HSCodeReferenceService()
         sanctions_service = SanctionsReferenceService()
         initialize_services(hs_service, sanctions_service)
@@ -393,43 +229,43 @@ async def interactive_mode():
     
     while True:
         try:
-            cmd = input("\n> ").strip().lower()
+            cmd = (await ainput("\n> ")).strip().lower()
             
             if not cmd:
                 continue
             
-            if cmd in ['quit', 'exit', 'q']:
+            if cmd in _QUIT_COMMANDS:
                 break
             
             if cmd == 'list':
                 print("\nAvailable samples:")
-                for key, sample in SAMPLE_DECLARATIONS.items():
+                for key, sample in _samples().items():
                     print(f"  {key}: {sample['name']}")
                 continue
             
             if cmd.startswith('sample '):
                 sample_key = cmd.split(' ', 1)[1]
-                if sample_key in SAMPLE_DECLARATIONS:
-                    sample = SAMPLE_DECLARATIONS[sample_key]
+                sample = _samples().get(sample_key)
+                if sample:
                     await run_test(sample["name"], sample["data"])
                 else:
                     print(f"Unknown sample: {sample_key}")
-                    print(f"Available: {', '.join(SAMPLE_DECLARATIONS.keys())}")
+                    print(f"Available: {', '.join(_samples().keys())}")
                 continue
             
             if cmd == 'json':
                 print("Enter JSON declaration (paste and press Enter twice):")
                 lines = []
                 while True:
-                    line = input()
+                    line = await ainput()
                     if not line and lines and not lines[-1]:
                         break
                     lines.append(line)
                 
                 try:
-                    declaration_data = json.loads('\n'.join(lines))
+                    declaration_data = json_loads('\n'.join(lines))
                     await run_test("Custom Declaration", declaration_data)
-                except json.JSONDecodeError as e:
+                except JSONDecodeError as e:
                     print(f"Invalid JSON: {e}")
                 continue
             
@@ -444,6 +280,14 @@ async def interactive_mode():
     print("\nGoodbye!")
 
 
+async def _run(coro):
+    """Await a test entry point, then close the Foundry clients it reused."""
+    try:
+        return await coro
+    finally:
+        await close_foundry_clients()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Test the compliance workflow locally")
     parser.add_argument('--sample', type=str, help="Run a specific sample test")
@@ -454,21 +298,21 @@ def main():
     
     if args.list:
         print("Available samples:")
-        for key, sample in SAMPLE_DECLARATIONS.items():
+        for key, sample in _samples().items():
             print(f"  {key}: {sample['name']}")
         return
     
     if args.interactive:
-        asyncio.run(interactive_mode())
+        asyncio.run(_run(interactive_mode()))
     elif args.sample:
-        if args.sample in SAMPLE_DECLARATIONS:
-            sample = SAMPLE_DECLARATIONS[args.sample]
-            asyncio.run(run_test(sample["name"], sample["data"]))
+        sample = _samples().get(args.sample)
+        if sample:
+            asyncio.run(_run(run_test(sample["name"], sample["data"])))
         else:
             print(f"Unknown sample: {args.sample}")
-            print(f"Available: {', '.join(SAMPLE_DECLARATIONS.keys())}")
+            print(f"Available: {', '.join(_samples().keys())}")
     else:
-        asyncio.run(run_all_tests())
+        asyncio.run(_run(run_all_tests()))
 
 
 if __name__ == "__main__":
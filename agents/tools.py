@@ -7,21 +7,200 @@ reference data from CosmosDB and perform compliance checks.
 Tools are defined using the @ai_function decorator from Microsoft Agent Framework.
 """
 
-from typing import Annotated, Optional, Any
+import copy
+import re
+import threading
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from functools import wraps
+from typing import Annotated, Callable, Optional, Any
 from pydantic import Field
 
 from agent_framework import ai_function
 
+# HS code format validation (used when no reference service is available)
+_STRIP_TABLE = str.maketrans('', '', ' .-\t\n\r\f\v')
+_HS_FMT = re.compile(r'^\d{4,10}\Z')
+
 # These will be initialized when the workflow starts
 _hs_code_service = None
 _sanctions_service = None
+_services_initialized = False
+_init_lock = threading.Lock()
+
+
+def initialize_services(hs_code_service, sanctions_service, force: bool = False):
+    """Initialize the reference data services for tools to use.
+    
+    Only the first call takes effect so that warm service clients and tool
+    caches survive repeated entry points; pass force=True to replace them.
+    """
+    global _hs_code_service, _sanctions_service, _services_initialized
+    with _init_lock:
+        if _services_initialized and not force:
+            return
+        _hs_code_service = hs_code_service
+        _sanctions_service = sanctions_service
+        _services_initialized = True
+        clear_tool_caches()
+
+
+def services_initialized() -> bool:
+    """Return True once reference services have been registered."""
+    return _services_initialized
+
+
+# =============================================================================
+# Reference Data Caches
+# =============================================================================
+# HS code reference data is static between service re-initializations, and
+# the same codes recur across goods lines and agents. Cached values are shared
+# between callers and must not be mutated.
+#
+# The services report query failures as None or empty results, so only
+# truthy results are kept: a transient CosmosDB error is retried on the next
+# call instead of being remembered as "not found" or a clear screening.
+
+_TOOL_CACHE_SIZE = 4096
+
+_hs_cache: OrderedDict[tuple, Any] = OrderedDict()
+_screening_cache: OrderedDict[tuple, Any] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _lru_cached(cache: OrderedDict, key: tuple, compute: Callable[[], Any], keep: Callable[[Any], bool]) -> Any:
+    """Return the cached value for key (LRU, bounded), storing it only if keep(value)."""
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = compute()
+    if keep(value):
+        with _cache_lock:
+            cache[key] = value
+            if len(cache) > _TOOL_CACHE_SIZE:
+                cache.popitem(last=False)
+    return value
+
+
+def _normalize_code(code: str) -> str:
+    """Normalize an HS code so equivalent spellings share a cache entry."""
+    return code.strip().replace('.', '').replace(' ', '')
+
+
+def _normalize_description(description: str) -> str:
+    """Normalize a goods description so equivalent queries share a cache entry."""
+    return ' '.join(description.split()).lower()
+
+
+def _cached_lookup(code: str) -> Optional[dict[str, Any]]:
+    return _lru_cached(_hs_cache, ("lookup", code), lambda: _hs_code_service.lookup_code(code), bool)
+
+
+def _cached_search(description: str, max_results: int) -> list[dict[str, Any]]:
+    return _lru_cached(
+        _hs_cache,
+        ("search", description, max_results),
+        lambda: _hs_code_service.search_by_description(description, max_results=max_results),
+        bool,
+    )
+
+
+def _cached_validate(code: str) -> dict[str, Any]:
+    return _lru_cached(_hs_cache, ("validate", code), lambda: _hs_code_service.validate_code_format(code), bool)
+
+
+def _cached_similar(code: str, max_results: int) -> list[dict[str, Any]]:
+    return _lru_cached(
+        _hs_cache,
+        ("similar", code, max_results),
+        lambda: _hs_code_service.find_similar_codes(code, max_results=max_results),
+        bool,
+    )
+
+
+def _is_screening_hit(value: Any) -> bool:
+    return bool(value) and (not isinstance(value, dict) or bool(value.get("matches")))
+
+
+def _screening_cached(key: tuple, compute: Callable[[], Any]) -> Any:
+    """Return the process-cached sanctions screening result for key."""
+    return _lru_cached(_screening_cache, key, compute, _is_screening_hit)
+
+
+# get_sanctions_regimes result; the regime list is static per service
+_regimes_result: Optional[dict[str, Any]] = None
+
+
+def clear_tool_caches():
+    """Drop all cached reference data lookups (called on service re-init)."""
+    global _regimes_result
+    _regimes_result = None
+    with _cache_lock:
+        _hs_cache.clear()
+        _screening_cache.clear()
+
+
+# Sanctions screening results for the current workflow run. Several agents
+# screen the same shipper/consignee names per declaration; begin_run()
+# installs a fresh dict so each distinct query hits the service at most once
+# per run. Tasks spawned by the run inherit the same dict via the context.
+_run_cache: ContextVar[Optional[dict]] = ContextVar("sanctions_run_cache", default=None)
+
+
+def begin_run() -> None:
+    """Start a new per-run sanctions screening cache in the current context."""
+    _run_cache.set({})
+
+
+def _screening_key(name: str, country: Optional[str]) -> tuple[str, str]:
+    return name.strip().casefold(), (country or "").strip().upper()
+
+
+def _run_cached(key: tuple, compute: Callable[[], Any]) -> Any:
+    """Return the run-cached value for key, computing it on first use.
+    
+    Misses fall through to the process-wide screening cache. Exceptions
+    propagate without being cached. Outside a run (no begin_run() in this
+    context) only the process-wide cache is consulted.
+    """
+    cache = _run_cache.get()
+    if cache is None:
+        return _screening_cached(key, compute)
+    if key not in cache:
+        cache[key] = _screening_cached(key, compute)
+    return cache[key]
+
+
+# =============================================================================
+# Tool Guards
+# =============================================================================
+
+def _requires_service(attr: str, label: str, **empty: Any) -> Callable[[Callable], Callable]:
+    """Guard a tool on its reference service and report errors uniformly.
+    
+    The service global is read at call time. When it is not initialized, or
+    the tool raises, the tool returns {"error": ..., **empty} instead.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if globals()[attr] is None:
+                return {"error": f"{label} service not initialized", **empty}
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                return {"error": str(e), **empty}
+        return wrapper
+    return decorator
+
+
+def _hs_tool(**empty: Any) -> Callable[[Callable], Callable]:
+    return _requires_service("_hs_code_service", "HS code", **empty)
 
 
-def initialize_services(hs_code_service, sanctions_service):
-    """Initialize the reference data services for tools to use."""
-    global _hs_code_service, _sanctions_service
-    _hs_code_service = hs_code_service
-    _sanctions_service = sanctions_service
+def _sanctions_tool(**empty: Any) -> Callable[[Callable], Callable]:
+    return _requires_service("_sanctions_service", "Sanctions", **empty)
 
 
 # =============================================================================
@@ -32,6 +211,7 @@ def initialize_services(hs_code_service, sanctions_service):
     name="lookup_hs_code",
     description="Look up an HS code in the UK Tariff database to get its description and details"
 )
+@_hs_tool(found=False)
 def lookup_hs_code(
     code: Annotated[str, Field(description="The HS code to look up (4-10 digits)")]
 ) -> dict[str, Any]:
@@ -40,32 +220,27 @@ def lookup_hs_code(
     
     Returns the code description, chapter, heading, and validity information.
     """
-    if _hs_code_service is None:
-        return {"error": "HS code service not initialized", "found": False}
-    
-    try:
-        result = _hs_code_service.lookup_code(code)
-        if result:
-            return {
-                "found": True,
-                "code": result.get("code", code),
-                "description": result.get("description", ""),
-                "chapter": result.get("chapterCode", ""),
-                "chapter_description": result.get("chapterDescription", ""),
-                "heading": result.get("headingCode", ""),
-                "valid_from": result.get("validFrom", ""),
-                "valid_to": result.get("validTo", ""),
-            }
-        else:
-            return {"found": False, "code": code, "message": "Code not found in UK Tariff database"}
-    except Exception as e:
-        return {"error": str(e), "found": False}
+    result = _cached_lookup(_normalize_code(code))
+    if result:
+        return {
+            "found": True,
+            "code": result.get("code", code),
+            "description": result.get("description", ""),
+            "chapter": result.get("chapterCode", ""),
+            "chapter_description": result.get("chapterDescription", ""),
+            "heading": result.get("headingCode", ""),
+            "valid_from": result.get("validFrom", ""),
+            "valid_to": result.get("validTo", ""),
+        }
+    else:
+        return {"found": False, "code": code, "message": "Code not found in UK Tariff database"}
 
 
 @ai_function(
     name="search_hs_codes_by_description",
     description="Search for HS codes matching a goods description"
 )
+@_hs_tool(results=[])
 def search_hs_codes_by_description(
     description: Annotated[str, Field(description="The goods description to search for")],
     max_results: Annotated[int, Field(description="Maximum number of results to return")] = 10
@@ -75,25 +250,19 @@ def search_hs_codes_by_description(
     
     Uses text search against the UK Tariff database.
     """
-    if _hs_code_service is None:
-        return {"error": "HS code service not initialized", "results": []}
-    
-    try:
-        results = _hs_code_service.search_by_description(description, max_results=max_results)
-        return {
-            "query": description,
-            "result_count": len(results),
-            "results": [
-                {
-                    "code": r.get("code", ""),
-                    "description": r.get("description", ""),
-                    "chapter": r.get("chapterCode", ""),
-                }
-                for r in results
-            ]
-        }
-    except Exception as e:
-        return {"error": str(e), "results": []}
+    results = _cached_search(_normalize_description(description), max_results)
+    return {
+        "query": description,
+        "result_count": len(results),
+        "results": [
+            {
+                "code": r.get("code", ""),
+                "description": r.get("description", ""),
+                "chapter": r.get("chapterCode", ""),
+            }
+            for r in results
+        ]
+    }
 
 
 @ai_function(
@@ -110,9 +279,8 @@ def validate_hs_code_format(
     """
     if _hs_code_service is None:
         # Basic validation without service
-        import re
-        cleaned = re.sub(r'[\s\.\-]', '', code)
-        is_valid = bool(re.match(r'^\d{4,10}$', cleaned))
+        cleaned = code.translate(_STRIP_TABLE)
+        is_valid = _HS_FMT.match(cleaned) is not None
         return {
             "code": code,
             "normalized": cleaned,
@@ -121,7 +289,9 @@ def validate_hs_code_format(
         }
     
     try:
-        result = _hs_code_service.validate_code_format(code)
+        # Deep copy so callers cannot alter the cached issues/components
+        result = copy.deepcopy(_cached_validate(_normalize_code(code)))
+        result["original"] = code
         return result
     except Exception as e:
         return {"error": str(e), "is_valid_format": False}
@@ -131,6 +301,7 @@ def validate_hs_code_format(
     name="find_similar_hs_codes",
     description="Find HS codes similar to a given code (for suggestions when code not found)"
 )
+@_hs_tool(similar_codes=[])
 def find_similar_hs_codes(
     code: Annotated[str, Field(description="The HS code to find similar codes for")],
     max_results: Annotated[int, Field(description="Maximum number of results")] = 5
@@ -140,23 +311,17 @@ def find_similar_hs_codes(
     
     Useful for suggesting alternatives when a code is not found.
     """
-    if _hs_code_service is None:
-        return {"error": "HS code service not initialized", "similar_codes": []}
-    
-    try:
-        results = _hs_code_service.find_similar_codes(code, max_results=max_results)
-        return {
-            "original_code": code,
-            "similar_codes": [
-                {
-                    "code": r.get("code", ""),
-                    "description": r.get("description", ""),
-                }
-                for r in results
-            ]
-        }
-    except Exception as e:
-        return {"error": str(e), "similar_codes": []}
+    results = _cached_similar(_normalize_code(code), max_results)
+    return {
+        "original_code": code,
+        "similar_codes": [
+            {
+                "code": r.get("code", ""),
+                "description": r.get("description", ""),
+            }
+            for r in results
+        ]
+    }
 
 
 # =============================================================================
@@ -167,6 +332,7 @@ def find_similar_hs_codes(
     name="search_sanctions_by_name",
     description="Search UK Sanctions List (OFSI) for entities by name"
 )
+@_sanctions_tool(matches=[])
 def search_sanctions_by_name(
     name: Annotated[str, Field(description="The name to search for (partial match supported)")],
     entity_type: Annotated[Optional[str], Field(description="Filter by entity type: Individual, Entity, or Ship")] = None,
@@ -177,35 +343,33 @@ def search_sanctions_by_name(
     
     Performs case-insensitive partial matching.
     """
-    if _sanctions_service is None:
-        return {"error": "Sanctions service not initialized", "matches": []}
-    
-    try:
-        entities = _sanctions_service.search_by_name(name, max_results=max_results, entity_type=entity_type)
-        return {
-            "query": name,
-            "match_count": len(entities),
-            "matches": [
-                {
-                    "name": e.name,
-                    "unique_id": e.unique_id,
-                    "entity_type": e.entity_type,
-                    "regime_name": e.regime_name,
-                    "sanctions_imposed": e.sanctions_imposed[:200] if e.sanctions_imposed else "",
-                    "nationality": e.nationality,
-                    "address_country": e.address_country,
-                }
-                for e in entities
-            ]
-        }
-    except Exception as e:
-        return {"error": str(e), "matches": []}
+    entities = _run_cached(
+        ("search_by_name", name.strip().casefold(), entity_type, max_results),
+        lambda: _sanctions_service.search_by_name(name, max_results=max_results, entity_type=entity_type),
+    )
+    return {
+        "query": name,
+        "match_count": len(entities),
+        "matches": [
+            {
+                "name": e.name,
+                "unique_id": e.unique_id,
+                "entity_type": e.entity_type,
+                "regime_name": e.regime_name,
+                "sanctions_imposed": e.sanctions_imposed[:200] if e.sanctions_imposed else "",
+                "nationality": e.nationality,
+                "address_country": e.address_country,
+            }
+            for e in entities
+        ]
+    }
 
 
 @ai_function(
     name="search_sanctions_by_country",
     description="Search UK Sanctions List for entities associated with a country"
 )
+@_sanctions_tool(matches=[])
 def search_sanctions_by_country(
     country: Annotated[str, Field(description="The country name to search for")],
     max_results: Annotated[int, Field(description="Maximum number of results")] = 50
@@ -215,41 +379,31 @@ def search_sanctions_by_country(
     
     Searches both address country and nationality fields.
     """
-    if _sanctions_service is None:
-        return {"error": "Sanctions service not initialized", "matches": []}
+    entities = _sanctions_service.search_by_country(country, max_results=max_results)
     
-    try:
-        entities = _sanctions_service.search_by_country(country, max_results=max_results)
-        
-        # Group by regime for summary
-        regimes = {}
-        for e in entities:
-            regime = e.regime_name or "Unknown"
-            if regime not in regimes:
-                regimes[regime] = 0
-            regimes[regime] += 1
-        
-        return {
-            "query_country": country,
-            "total_matches": len(entities),
-            "regimes_involved": regimes,
-            "sample_entities": [
-                {
-                    "name": e.name,
-                    "entity_type": e.entity_type,
-                    "regime_name": e.regime_name,
-                }
-                for e in entities[:10]  # First 10 as sample
-            ]
-        }
-    except Exception as e:
-        return {"error": str(e), "matches": []}
+    # Group by regime for summary
+    regimes = Counter(e.regime_name or "Unknown" for e in entities)
+    
+    return {
+        "query_country": country,
+        "total_matches": len(entities),
+        "regimes_involved": dict(regimes),
+        "sample_entities": [
+            {
+                "name": e.name,
+                "entity_type": e.entity_type,
+                "regime_name": e.regime_name,
+            }
+            for e in entities[:10]  # First 10 as sample
+        ]
+    }
 
 
 @ai_function(
     name="check_entity_sanctions",
     description="Comprehensive sanctions screening for an entity name with relevance scoring"
 )
+@_sanctions_tool(matched=False)
 def check_entity_sanctions(
     name: Annotated[str, Field(description="The entity name to screen")],
     country: Annotated[Optional[str], Field(description="Country for filtering/relevance boost")] = None,
@@ -261,63 +415,106 @@ def check_entity_sanctions(
     Returns detailed match information including relevance scores and match types.
     This is the main method for compliance screening.
     """
-    if _sanctions_service is None:
-        return {"error": "Sanctions service not initialized", "matched": False}
+    result = _run_cached(
+        ("check_entity", *_screening_key(name, country), strict_match),
+        lambda: _sanctions_service.check_entity(name, country=country, strict_match=strict_match),
+    )
+    return {
+        "screened_name": result["screened_name"],
+        "screened_country": result["screened_country"],
+        "matched": result["matched"],
+        "exact_matches": result["exact_matches"],
+        "partial_matches": result["partial_matches"],
+        "total_matches": len(result["matches"]),
+        "matches": result["matches"][:10],  # Top 10 matches with details
+    }
+
+
+@ai_function(
+    name="check_entities_batch",
+    description="Sanctions screening for several entity names in one call (e.g. shipper, consignee, notify party)"
+)
+@_sanctions_tool(results=[])
+def check_entities_batch(
+    names: Annotated[list[str], Field(description="The entity names to screen")],
+    country: Annotated[Optional[str], Field(description="Country for filtering/relevance boost")] = None,
+    strict_match: Annotated[bool, Field(description="If true, require stricter name matching")] = False
+) -> dict[str, Any]:
+    """
+    Screen several entity names against the sanctions list in one call.
     
-    try:
-        result = _sanctions_service.check_entity(name, country=country, strict_match=strict_match)
-        return {
-            "screened_name": result["screened_name"],
-            "screened_country": result["screened_country"],
-            "matched": result["matched"],
-            "exact_matches": result["exact_matches"],
-            "partial_matches": result["partial_matches"],
-            "total_matches": len(result["matches"]),
-            "matches": result["matches"][:10],  # Top 10 matches with details
-        }
-    except Exception as e:
-        return {"error": str(e), "matched": False}
+    Each name is screened as by check_entity_sanctions (sharing its per-run
+    cache); duplicate names are screened once.
+    """
+    results = []
+    for name in dict.fromkeys(names):
+        try:
+            result = _run_cached(
+                ("check_entity", *_screening_key(name, country), strict_match),
+                lambda: _sanctions_service.check_entity(name, country=country, strict_match=strict_match),
+            )
+            results.append({
+                "screened_name": result["screened_name"],
+                "matched": result["matched"],
+                "exact_matches": result["exact_matches"],
+                "partial_matches": result["partial_matches"],
+                "total_matches": len(result["matches"]),
+                "matches": result["matches"][:5],  # Top 5 matches per name
+            })
+        except Exception as e:
+            results.append({"screened_name": name, "error": str(e), "matched": False})
+    
+    return {
+        "screened_country": country,
+        "screened_count": len(results),
+        "matched_count": sum(1 for r in results if r["matched"]),
+        "results": results,
+    }
 
 
 @ai_function(
     name="get_sanctions_regimes",
     description="Get list of active sanctions regimes in the database"
 )
+@_sanctions_tool(regimes={})
 def get_sanctions_regimes() -> dict[str, Any]:
     """
     Get statistics on sanctions regimes in the database.
     
     Returns regime codes and entity counts.
     """
-    if _sanctions_service is None:
-        return {"error": "Sanctions service not initialized", "regimes": {}}
+    global _regimes_result
+    if _regimes_result is not None:
+        return _regimes_result
     
-    try:
-        stats = _sanctions_service.get_regime_statistics()
-        return {
-            "regime_count": len(stats),
-            "regimes": stats,
-        }
-    except Exception as e:
-        return {"error": str(e), "regimes": {}}
+    stats = _sanctions_service.get_regime_statistics()
+    result = {
+        "regime_count": len(stats),
+        "regimes": stats,
+    }
+    # An empty result is how the service reports a failed query
+    if stats:
+        _regimes_result = result
+    return result
 
 
 # =============================================================================
 # Export all tools
 # =============================================================================
 
-HS_CODE_TOOLS = [
+HS_CODE_TOOLS = (
     lookup_hs_code,
     search_hs_codes_by_description,
     validate_hs_code_format,
     find_similar_hs_codes,
-]
+)
 
-SANCTIONS_TOOLS = [
+SANCTIONS_TOOLS = (
     search_sanctions_by_name,
     search_sanctions_by_country,
     check_entity_sanctions,
+    check_entities_batch,
     get_sanctions_regimes,
-]
+)
 
 ALL_TOOLS = HS_CODE_TOOLS + SANCTIONS_TOOLS
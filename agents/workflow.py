@@ -31,13 +31,20 @@ Or import and use programmatically:
 
 import asyncio
 import argparse
+import hashlib
 import json
+import logging
 import os
 import sys
-from dataclasses import dataclass, field
-from datetime import datetime
+import time
+import weakref
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
 
 from agent_framework import (
     AgentResponseUpdate,
@@ -45,74 +52,189 @@ from agent_framework import (
     Executor,
     WorkflowBuilder,
     WorkflowContext,
+    WorkflowEvent,
     WorkflowOutputEvent,
     handler,
 )
-from agent_framework.azure import AzureAIAgentClient
-from azure.ai.projects.aio import AIProjectClient
-from azure.ai.projects.models import (
-    PromptAgentDefinition,
-    AzureAISearchAgentTool,
-    AzureAISearchToolResource,
-    AISearchIndexResource,
-    AzureAISearchQueryType,
-    BingGroundingAgentTool,
-    BingGroundingSearchToolParameters,
-    BingGroundingSearchConfiguration,
-)
-from azure.identity.aio import AzureCliCredential
 from dotenv import load_dotenv
 from typing_extensions import Never
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+# The Azure SDK modules are imported where they are used so that importing
+# this module (or running the CLI for --help) does not load them
+if TYPE_CHECKING:
+    from azure.ai.projects.aio import AIProjectClient
+
+# Directory holding this module and the agent YAML files
+_AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+logger = logging.getLogger('autonomousflow.compliance.workflow')
+
 # Add backend to path for service imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
-
-# Import tools for local workflow execution
-from tools import (
-    initialize_services,
-    HS_CODE_TOOLS,
-    SANCTIONS_TOOLS,
-    lookup_hs_code,
-    search_hs_codes_by_description,
-    validate_hs_code_format,
-    find_similar_hs_codes,
-    search_sanctions_by_name,
-    search_sanctions_by_country,
-    check_entity_sanctions,
-    get_sanctions_regimes,
-)
+sys.path.insert(0, os.path.join(_AGENT_DIR, '..', 'backend'))
 
 # Load environment
-load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'backend', '.env'))
+load_dotenv(os.path.join(_AGENT_DIR, '..', 'backend', '.env'))
 
 # Configuration
 AZURE_AI_PROJECT_ENDPOINT = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
 AZURE_AI_MODEL_DEPLOYMENT_NAME = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME", "gpt-41")
 AZURE_AI_MODEL_MINI_DEPLOYMENT_NAME = os.getenv("AZURE_AI_MODEL_MINI_DEPLOYMENT_NAME", "gpt-41-mini")
 
+# Upper bound on concurrent Foundry agent runs per process, across all
+# in-flight compliance checks
+MAX_AGENT_CONCURRENCY = int(os.getenv("MAX_AGENT_CONCURRENCY", "8"))
+
+# Concurrent Foundry management calls (agent create/delete) during setup
+FOUNDRY_ADMIN_CONCURRENCY = int(os.getenv("FOUNDRY_ADMIN_CONCURRENCY", "8"))
+
+# Seconds a single agent run may take (per declaration in a batched prompt)
+# before it is cancelled and reported as an error, so one stuck agent cannot
+# stall the whole check
+AGENT_TIMEOUT_SECONDS = float(os.getenv("AGENT_TIMEOUT_SECONDS", "90"))
+
+# Run single-declaration checks by calling the agents directly from an
+# asyncio.TaskGroup instead of through the WorkflowBuilder graph
+USE_DIRECT_FANOUT = os.getenv("COMPLIANCE_DIRECT_FANOUT", "false").lower() == "true"
+
+# Declarations sent to each agent in one prompt by run_compliance_check_batch
+COMPLIANCE_BATCH_SIZE = int(os.getenv("COMPLIANCE_BATCH_SIZE", "5"))
+
 # File to store created agent IDs for reuse
-AGENT_IDS_FILE = os.path.join(os.path.dirname(__file__), ".foundry_agent_ids.json")
+AGENT_IDS_FILE = os.path.join(_AGENT_DIR, ".foundry_agent_ids.json")
+
+# Seconds after a successful check during which the saved agent IDs are
+# trusted without asking Foundry whether the agents still exist (0 = always check)
+FOUNDRY_AGENT_CACHE_TTL = float(os.getenv("FOUNDRY_AGENT_CACHE_TTL", "900"))
+
+
+def _json_loads(data: str | bytes) -> Any:
+    """Parse JSON with orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes with orjson when available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _read_agent_ids_file() -> tuple[dict[str, str], float]:
+    """
+    Read the saved Foundry agent IDs and when they were last verified.
+    
+    Files written before verification stamps were added hold the bare
+    name -> ID mapping and count as never verified.
+    """
+    with open(AGENT_IDS_FILE, 'rb') as f:
+        data = _json_loads(f.read())
+    if isinstance(data.get("ids"), dict):
+        return data["ids"], float(data.get("verified_at") or 0)
+    return data, 0.0
+
+
+def _load_agent_ids() -> dict[str, str]:
+    """Read the saved Foundry agent IDs."""
+    return _read_agent_ids_file()[0]
+
+
+# Agent IDs from the last read of AGENT_IDS_FILE with the file's mtime, so
+# runs skip re-reading it until it is rewritten (possibly by another process)
+_agent_ids_cache: Optional[tuple[int, dict[str, str]]] = None
+
+
+def _cached_agent_ids() -> Optional[dict[str, str]]:
+    """Return the saved Foundry agent IDs, or None if there is no file."""
+    global _agent_ids_cache
+    try:
+        mtime = os.stat(AGENT_IDS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        _agent_ids_cache = None
+        return None
+    
+    cached = _agent_ids_cache
+    if cached is None or cached[0] != mtime:
+        cached = _agent_ids_cache = (mtime, _load_agent_ids())
+    return cached[1]
+
+
+def _forget_agent_ids() -> None:
+    """Drop the in-process copy of the agent IDs after the file changes."""
+    global _agent_ids_cache
+    _agent_ids_cache = None
+
+
+def _save_agent_ids(agent_ids: dict[str, str], verified_at: Optional[float] = None) -> None:
+    """
+    Write the Foundry agent IDs for later runs.
+    
+    Without a new verification time the write is skipped when the file
+    already holds the same IDs; otherwise it goes to a temp file that is
+    renamed so concurrent readers never see a partial file.
+    """
+    if verified_at is None:
+        try:
+            if _load_agent_ids() == agent_ids:
+                return
+        except (OSError, ValueError, AttributeError):
+            pass  # Missing or unreadable: write it
+    
+    data = {"ids": agent_ids, "verified_at": verified_at or 0.0}
+    tmp = f"{AGENT_IDS_FILE}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_json_dumps_pretty(data))
+    os.replace(tmp, AGENT_IDS_FILE)
+    _forget_agent_ids()
 
 
 # =============================================================================
 # Data Models
 # =============================================================================
 
-class Severity(str, Enum):
-    INFO = "info"
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+class _RankedStrEnum(str, Enum):
+    """String enum whose members also carry an integer rank (0 = lowest).
+    
+    The string value is kept for JSON output and parsing; the rank lets
+    aggregation count and compare members with plain integers.
+    """
+    
+    def __new__(cls, value: str, rank: int):
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.rank = rank
+        return member
+
+
+class Severity(_RankedStrEnum):
+    INFO = ("info", 0)
+    LOW = ("low", 1)
+    MEDIUM = ("medium", 2)
+    HIGH = ("high", 3)
+    CRITICAL = ("critical", 4)
+
+
+class Confidence(_RankedStrEnum):
+    LOW = ("low", 0)
+    MEDIUM = ("medium", 1)
+    HIGH = ("high", 2)
+
+
+# Lookup tables for parsing agent output; unknown values map to MEDIUM
+_SEVERITY_BY_VALUE = {member.value: member for member in Severity}
+_CONFIDENCE_BY_VALUE = {member.value: member for member in Confidence}
 
 
-class Confidence(str, Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
+def _lookup_member(table: dict, value: Any, default):
+    """Resolve a model-supplied enum value; null, non-string or unknown values give default."""
+    return table.get(value.lower(), default) if isinstance(value, str) else default
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Finding:
     """A compliance finding from an agent"""
     code: str
@@ -125,7 +247,7 @@ class Finding:
     agent: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentResult:
     """Result from a single agent"""
     agent_name: str
@@ -134,7 +256,7 @@ class AgentResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplianceReport:
     """Aggregated compliance report from all agents"""
     declaration_id: str
@@ -152,19 +274,73 @@ class ComplianceReport:
     recommendations: list[str] = field(default_factory=list)
 
 
+@dataclass(slots=True)
+class DeclarationBatch:
+    """Several declarations analyzed together, one prompt per agent"""
+    declarations: list[dict[str, Any]]
+
+
 # =============================================================================
 # Agent Configuration
 # =============================================================================
 
-def load_agent_yaml(yaml_file: str) -> dict:
-    """Load full agent configuration from a YAML file."""
+def _write_json_sidecar(path: str, data: dict) -> None:
+    """Atomically write parsed YAML as JSON; skipped if the directory is read-only."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        payload = orjson.dumps(data) if orjson else json.dumps(data).encode()
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except (OSError, TypeError):
+        # Not JSON-serializable or not writable; the YAML is still used
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=64)
+def _parse_yaml_file(filepath: str, mtime_ns: int, size: int) -> dict:
+    """
+    Parse a YAML file; cached per (path, mtime, size) so edits are picked up.
+    
+    A ``<file>.json`` sidecar at least as new as the YAML is loaded instead,
+    since JSON parses far faster. Otherwise the YAML is parsed and the
+    sidecar (re)written for next time (see scripts/yaml2json.py).
+    """
+    sidecar = filepath + '.json'
+    try:
+        if os.stat(sidecar).st_mtime_ns >= mtime_ns:
+            with open(sidecar, 'rb') as f:
+                return _json_loads(f.read())
+    except (OSError, ValueError):
+        pass  # No usable sidecar
+    
     import yaml
-    agent_dir = os.path.dirname(__file__)
-    filepath = os.path.join(agent_dir, yaml_file)
-    if os.path.exists(filepath):
-        with open(filepath, 'r') as f:
-            return yaml.safe_load(f) or {}
-    return {}
+    # libyaml's C loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    # Binary read: the loader detects the encoding itself, which skips
+    # a separate text-decoding pass
+    with open(filepath, 'rb') as f:
+        data = yaml.load(f, Loader=loader) or {}
+    _write_json_sidecar(sidecar, data)
+    return data
+
+
+def load_agent_yaml(yaml_file: str) -> dict:
+    """
+    Load full agent configuration from a YAML file.
+    
+    The parsed dict is cached until the file changes and is shared between
+    callers, so treat it as read-only.
+    """
+    filepath = os.path.join(_AGENT_DIR, yaml_file)
+    try:
+        st = os.stat(filepath)
+        return _parse_yaml_file(filepath, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return {}
 
 
 def load_agent_instructions(yaml_file: str) -> str:
@@ -173,6 +349,17 @@ def load_agent_instructions(yaml_file: str) -> str:
     return data.get('instructions', '')
 
 
+# YAML query_type -> AzureAISearchQueryType member name (the enum itself is
+# imported lazily with the rest of the Azure SDK models)
+_QUERY_TYPE_MEMBERS = MappingProxyType({
+    'simple': 'SIMPLE',
+    'semantic': 'SEMANTIC',
+    'vector': 'VECTOR',
+    'hybrid': 'VECTOR_SIMPLE_HYBRID',
+    'hybrid_semantic': 'VECTOR_SEMANTIC_HYBRID',
+})
+
+
 def load_agent_tools(yaml_file: str) -> list:
     """Load agent tools configuration from a YAML file.
     
@@ -185,6 +372,16 @@ def load_agent_tools(yaml_file: str) -> list:
     if not tools:
         return []
     
+    from azure.ai.projects.models import (
+        AzureAISearchAgentTool,
+        AzureAISearchToolResource,
+        AISearchIndexResource,
+        AzureAISearchQueryType,
+        BingGroundingAgentTool,
+        BingGroundingSearchToolParameters,
+        BingGroundingSearchConfiguration,
+    )
+    
     # Convert YAML tool definitions to SDK tool objects
     sdk_tools = []
     for tool_def in tools:
@@ -198,14 +395,7 @@ def load_agent_tools(yaml_file: str) -> list:
             for idx in indexes:
                 # Map query_type string to enum
                 query_type_str = idx.get('query_type', 'simple')
-                query_type_map = {
-                    'simple': AzureAISearchQueryType.SIMPLE,
-                    'semantic': AzureAISearchQueryType.SEMANTIC,
-                    'vector': AzureAISearchQueryType.VECTOR,
-                    'hybrid': AzureAISearchQueryType.VECTOR_SIMPLE_HYBRID,
-                    'hybrid_semantic': AzureAISearchQueryType.VECTOR_SEMANTIC_HYBRID,
-                }
-                query_type = query_type_map.get(query_type_str, AzureAISearchQueryType.SIMPLE)
+                query_type = getattr(AzureAISearchQueryType, _QUERY_TYPE_MEMBERS.get(query_type_str, 'SIMPLE'))
                 
                 index_resources.append(AISearchIndexResource(
                     project_connection_id=idx.get('project_connection_id'),
@@ -242,49 +432,63 @@ def load_agent_tools(yaml_file: str) -> list:
     return sdk_tools
 
 
+@lru_cache(maxsize=1)
 def get_agent_configs():
     """Get agent configurations.
     
-    Tools are now loaded from YAML files (generated by setup-azure.sh with connection IDs).
-    The 'local_tools' are only used for local workflow execution without Foundry.
+    Foundry-side tools are loaded from YAML files (generated by setup-azure.sh with
+    connection IDs). The 'local_tools' are function tools run in this process
+    against the reference services; they are listed by name and resolved with
+    resolve_local_tools() when the workflow executors are built, so that
+    building the configs does not import the tools module.
+    
+    The mapping depends only on import-time settings, so it is built once
+    and returned read-only.
     """
-    return {
+    configs = {
         "DocumentConsistencyAgent": {
             "yaml": "document-consistency-agent.yaml",
-            "local_tools": [],
+            "local_tools": (),
             "model": AZURE_AI_MODEL_MINI_DEPLOYMENT_NAME,
         },
         "HSCodeValidationAgent": {
             "yaml": "hs-code-validation-agent.yaml",
-            "local_tools": [lookup_hs_code, search_hs_codes_by_description, validate_hs_code_format, find_similar_hs_codes],
+            "local_tools": ("lookup_hs_code", "search_hs_codes_by_description", "validate_hs_code_format", "find_similar_hs_codes"),
             "model": AZURE_AI_MODEL_DEPLOYMENT_NAME,
         },
         "CountryRestrictionsAgent": {
             "yaml": "country-restrictions-agent.yaml",
-            "local_tools": [search_sanctions_by_name, search_sanctions_by_country, check_entity_sanctions, get_sanctions_regimes],
+            "local_tools": ("search_sanctions_by_name", "search_sanctions_by_country", "check_entity_sanctions", "check_entities_batch", "get_sanctions_regimes"),
             "model": AZURE_AI_MODEL_DEPLOYMENT_NAME,
         },
         "CountryOfOriginAgent": {
             "yaml": "country-of-origin-agent.yaml",
-            "local_tools": [],
+            "local_tools": (),
             "model": AZURE_AI_MODEL_DEPLOYMENT_NAME,
         },
         "ControlledGoodsAgent": {
             "yaml": "controlled-goods-agent.yaml",
-            "local_tools": [],
+            "local_tools": (),
             "model": AZURE_AI_MODEL_DEPLOYMENT_NAME,
         },
         "ValueReasonablenessAgent": {
             "yaml": "value-reasonableness-agent.yaml",
-            "local_tools": [],
+            "local_tools": (),
             "model": AZURE_AI_MODEL_MINI_DEPLOYMENT_NAME,
         },
         "ShipperVerificationAgent": {
             "yaml": "shipper-verification-agent.yaml",
-            "local_tools": [search_sanctions_by_name, search_sanctions_by_country, check_entity_sanctions, get_sanctions_regimes],
+            "local_tools": ("search_sanctions_by_name", "search_sanctions_by_country", "check_entity_sanctions", "check_entities_batch", "get_sanctions_regimes"),
             "model": AZURE_AI_MODEL_DEPLOYMENT_NAME,
         },
     }
+    return MappingProxyType({name: MappingProxyType(config) for name, config in configs.items()})
+
+
+def resolve_local_tools(config: dict) -> list:
+    """Return the tool functions named in an agent config's 'local_tools'."""
+    import tools
+    return [getattr(tools, name) for name in config.get("local_tools", ())]
 
 
 # Keep AGENT_CONFIGS for backward compatibility (evaluated at import time)
@@ -311,6 +515,8 @@ async def create_foundry_agents(delete_existing: bool = False) -> dict[str, str]
     if not AZURE_AI_PROJECT_ENDPOINT:
         raise ValueError("AZURE_AI_PROJECT_ENDPOINT environment variable is required")
     
+    from azure.ai.projects.models import PromptAgentDefinition
+    
     print("=" * 70)
     print("Creating Persistent Agents in Azure AI Foundry")
     print("=" * 70)
@@ -321,98 +527,131 @@ async def create_foundry_agents(delete_existing: bool = False) -> dict[str, str]
     
     # Load existing agent IDs if available
     existing_ids = {}
+    verified_at = 0.0
     if os.path.exists(AGENT_IDS_FILE) and not delete_existing:
-        with open(AGENT_IDS_FILE, 'r') as f:
-            existing_ids = json.load(f)
-            print(f"Found {len(existing_ids)} existing agent IDs")
+        existing_ids, verified_at = await asyncio.to_thread(_read_agent_ids_file)
+        print(f"Found {len(existing_ids)} existing agent IDs")
     
     # Get agent configs with current env vars
     agent_configs = get_agent_configs()
     
-    async with (
-        AzureCliCredential() as credential,
-        AIProjectClient(endpoint=AZURE_AI_PROJECT_ENDPOINT, credential=credential) as project_client,
-    ):
-        # Verify existing agents still exist in Foundry
-        if existing_ids and not delete_existing:
-            all_exist = True
-            for name in agent_configs.keys():
-                if name not in existing_ids:
-                    print(f"  Agent {name} not in cached IDs, will create")
-                    all_exist = False
-                    break
-                try:
-                    agent_name = existing_ids[name].split(":")[0] if ":" in existing_ids[name] else name
-                    await project_client.agents.get(agent_name)
-                except Exception:
+    # Recently verified IDs are reused without any Foundry round-trips
+    age = time.time() - verified_at
+    if existing_ids and age < FOUNDRY_AGENT_CACHE_TTL and all(name in existing_ids for name in agent_configs):
+        print(f"Agents verified {age:.0f}s ago, skipping Foundry check")
+        return existing_ids
+    
+    # Reuse this loop's credential and project client (see _FoundrySession)
+    project_client = await _foundry_session().project_client()
+    
+    # Verify existing agents still exist in Foundry
+    if existing_ids and not delete_existing:
+        missing = [name for name in agent_configs if name not in existing_ids]
+        for name in missing:
+            print(f"  Agent {name} not in cached IDs, will create")
+        
+        all_exist = not missing
+        if all_exist:
+            # Probe every cached agent at once rather than one per round trip
+            names = list(agent_configs)
+            probes = await asyncio.gather(
+                *(
+                    project_client.agents.get(
+                        existing_ids[name].split(":")[0] if ":" in existing_ids[name] else name
+                    )
+                    for name in names
+                ),
+                return_exceptions=True,
+            )
+            for name, probe in zip(names, probes):
+                if isinstance(probe, Exception):
                     print(f"  Agent {name} not found in Foundry, will recreate")
                     all_exist = False
-                    break
-            
-            if all_exist:
-                print("All agents exist in Foundry, skipping creation")
-                return existing_ids
-            else:
-                existing_ids = {}  # Clear stale cache
         
-        # Delete existing agents if requested
-        if delete_existing and os.path.exists(AGENT_IDS_FILE):
-            await cleanup_foundry_agents()
+        if all_exist:
+            print("All agents exist in Foundry, skipping creation")
+            await asyncio.to_thread(_save_agent_ids, existing_ids, time.time())
+            return existing_ids
+        else:
+            existing_ids = {}  # Clear stale cache
+    
+    # Delete existing agents if requested
+    if delete_existing and os.path.exists(AGENT_IDS_FILE):
+        await cleanup_foundry_agents()
+    
+    # Bounds concurrent create_version calls in case the service rate-limits
+    slots = asyncio.Semaphore(FOUNDRY_ADMIN_CONCURRENCY)
+    
+    async def _create_one(name: str, config: dict) -> tuple[str, str]:
+        lines = [f"Creating agent: {name}..."]
         
-        # Create each agent
-        for name, config in agent_configs.items():
-            print(f"Creating agent: {name}...")
-            
-            yaml_file = config["yaml"]
-            instructions = load_agent_instructions(yaml_file)
-            if not instructions:
-                instructions = f"You are the {name} compliance agent."
-            
-            model = config.get("model", AZURE_AI_MODEL_DEPLOYMENT_NAME)
-            
-            # Create the persistent agent in Foundry using Azure AI Projects 2.x API
-            # Uses create_version() with PromptAgentDefinition including tools
-            agent_definition = PromptAgentDefinition(
-                model=model,
-                instructions=instructions,
-            )
-            
-            # Load tools from YAML file (generated by setup-azure.sh with connection IDs)
-            tools = load_agent_tools(yaml_file)
-            if tools:
-                agent_definition["tools"] = tools
-                tool_names = []
-                for tool in tools:
-                    if hasattr(tool, 'azure_ai_search') and tool.azure_ai_search:
-                        for idx in tool.azure_ai_search.indexes:
-                            tool_names.append(f"AI Search: {idx.index_name}")
-                            print(f"    Tool: Azure AI Search index '{idx.index_name}'")
-                    if hasattr(tool, 'bing_grounding') and tool.bing_grounding:
-                        tool_names.append("Bing Web Search")
-                        print(f"    Tool: Bing Grounding web search")
-                print(f"    Total tools: {len(tools)}")
-            else:
-                print(f"    No tools configured (using LLM reasoning only)")
-            
+        yaml_file = config["yaml"]
+        instructions = load_agent_instructions(yaml_file)
+        if not instructions:
+            instructions = f"You are the {name} compliance agent."
+        
+        model = config.get("model", AZURE_AI_MODEL_DEPLOYMENT_NAME)
+        
+        # Create the persistent agent in Foundry using Azure AI Projects 2.x API
+        # Uses create_version() with PromptAgentDefinition including tools
+        agent_definition = PromptAgentDefinition(
+            model=model,
+            instructions=instructions,
+        )
+        
+        # Load tools from YAML file (generated by setup-azure.sh with connection IDs)
+        tools = load_agent_tools(yaml_file)
+        if tools:
+            agent_definition["tools"] = tools
+            for tool in tools:
+                if hasattr(tool, 'azure_ai_search') and tool.azure_ai_search:
+                    for idx in tool.azure_ai_search.indexes:
+                        lines.append(f"    Tool: Azure AI Search index '{idx.index_name}'")
+                if hasattr(tool, 'bing_grounding') and tool.bing_grounding:
+                    lines.append(f"    Tool: Bing Grounding web search")
+            lines.append(f"    Total tools: {len(tools)}")
+        else:
+            lines.append(f"    No tools configured (using LLM reasoning only)")
+        
+        async with slots:
             created_agent = await project_client.agents.create_version(
                 agent_name=name,
                 definition=agent_definition,
             )
-            
-            agent_ids[name] = f"{created_agent.name}:{created_agent.version}"
-            print(f"  ✓ Created: {name} (ID: {created_agent.id}, Version: {created_agent.version})")
         
-        # Save agent IDs for future use
-        with open(AGENT_IDS_FILE, 'w') as f:
-            json.dump(agent_ids, f, indent=2)
-        
-        print()
-        print(f"✓ Created {len(agent_ids)} agents in Azure AI Foundry")
-        print(f"  Agent IDs saved to: {AGENT_IDS_FILE}")
-        print()
-        print("You can now view these agents in the Azure AI Foundry portal!")
-        
-        return agent_ids
+        lines.append(f"  ✓ Created: {name} (ID: {created_agent.id}, Version: {created_agent.version})")
+        print("\n".join(lines))
+        return name, f"{created_agent.name}:{created_agent.version}"
+    
+    # Create all agents concurrently (each is an independent round-trip)
+    names = list(agent_configs)
+    results = await asyncio.gather(
+        *(_create_one(name, config) for name, config in agent_configs.items()),
+        return_exceptions=True,
+    )
+    failed = []
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            print(f"  ✗ Failed to create {name}: {result}")
+            failed.append(name)
+        else:
+            agent_ids[name] = result[1]
+    
+    # A partial set of IDs would be trusted by later runs and silently drop
+    # the missing checks, so save nothing unless every agent was created
+    if failed:
+        raise RuntimeError(f"Could not create agents in Azure AI Foundry: {', '.join(failed)}")
+    
+    # Save agent IDs for future use
+    await asyncio.to_thread(_save_agent_ids, agent_ids, time.time())
+    
+    print()
+    print(f"✓ Created {len(agent_ids)} agents in Azure AI Foundry")
+    print(f"  Agent IDs saved to: {AGENT_IDS_FILE}")
+    print()
+    print("You can now view these agents in the Azure AI Foundry portal!")
+    
+    return agent_ids
 
 
 async def cleanup_foundry_agents() -> None:
@@ -423,8 +662,7 @@ async def cleanup_foundry_agents() -> None:
         print("No agent IDs file found. Nothing to clean up.")
         return
     
-    with open(AGENT_IDS_FILE, 'r') as f:
-        agent_ids = json.load(f)
+    agent_ids = await asyncio.to_thread(_load_agent_ids)
     
     if not agent_ids:
         print("No agents to delete.")
@@ -434,103 +672,333 @@ async def cleanup_foundry_agents() -> None:
     print("Cleaning Up Agents from Azure AI Foundry")
     print("=" * 70)
     
-    async with (
-        AzureCliCredential() as credential,
-        AIProjectClient(endpoint=AZURE_AI_PROJECT_ENDPOINT, credential=credential) as project_client,
-    ):
-        for name, agent_id in agent_ids.items():
-            try:
-                # agent_id format is "name:version" - delete by name (deletes all versions)
-                agent_name = agent_id.split(":")[0] if ":" in agent_id else name
+    project_client = await _foundry_session().project_client()
+    
+    slots = asyncio.Semaphore(FOUNDRY_ADMIN_CONCURRENCY)
+    
+    async def _delete_one(name: str, agent_id: str) -> None:
+        try:
+            # agent_id format is "name:version" - delete by name (deletes all versions)
+            agent_name = agent_id.split(":")[0] if ":" in agent_id else name
+            async with slots:
                 await project_client.agents.delete(agent_name)
-                print(f"  ✓ Deleted: {name} (ID: {agent_id})")
-            except Exception as e:
-                print(f"  ✗ Failed to delete {name}: {e}")
+            print(f"  ✓ Deleted: {name} (ID: {agent_id})")
+        except Exception as e:
+            print(f"  ✗ Failed to delete {name}: {e}")
+    
+    await asyncio.gather(*(_delete_one(name, agent_id) for name, agent_id in agent_ids.items()))
     
     # Remove the IDs file
     os.remove(AGENT_IDS_FILE)
+    _forget_agent_ids()
     print()
     print("✓ Cleanup complete")
 
 
-async def list_foundry_agents() -> list[dict]:
+# Largest page the Foundry agents list endpoint returns
+_AGENT_LIST_PAGE_SIZE = 100
+
+
+async def list_foundry_agents() -> AsyncIterator[dict]:
     """
     List all agents in the Azure AI Foundry project.
+    
+    Agents are yielded as the listing pages arrive; collect with
+    ``[a async for a in list_foundry_agents()]`` when a list is needed.
+    Pages are requested at the service maximum size so large projects
+    take as few round-trips as possible.
     """
-    async with (
-        AzureCliCredential() as credential,
-        AIProjectClient(endpoint=AZURE_AI_PROJECT_ENDPOINT, credential=credential) as project_client,
-    ):
-        agents = []
-        async for agent in project_client.agents.list():
-            agents.append({
-                "name": agent.name,
-                "description": agent.description,
-            })
-        return agents
+    project_client = await _foundry_session().project_client()
+    async for agent in project_client.agents.list(limit=_AGENT_LIST_PAGE_SIZE):
+        yield {
+            "id": agent.id,
+            "name": agent.name,
+            "description": agent.description,
+        }
+
+
+# =============================================================================
+# Foundry Client Reuse
+# =============================================================================
+
+class _FoundrySession:
+    """
+    Credential, project client and ChatAgents shared by the compliance runs
+    and agent management calls on one event loop, so repeated calls skip
+    the credential exchange (an `az` subprocess for AzureCliCredential),
+    TLS setup and per-agent client construction.
+    """
+    
+    def __init__(self):
+        self._stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+        self._project_client: Optional["AIProjectClient"] = None
+        self._agents: dict[str, asyncio.Task[ChatAgent]] = {}
+        # Bounds agent.run() calls so bursts of declarations do not flood
+        # the model deployment with parallel requests
+        self.agent_slots = asyncio.Semaphore(MAX_AGENT_CONCURRENCY)
+    
+    async def project_client(self) -> "AIProjectClient":
+        async with self._lock:
+            if self._project_client is None:
+                from azure.ai.projects.aio import AIProjectClient
+                from azure.identity.aio import AzureCliCredential
+                
+                credential = await self._stack.enter_async_context(AzureCliCredential())
+                self._project_client = await self._stack.enter_async_context(
+                    AIProjectClient(endpoint=AZURE_AI_PROJECT_ENDPOINT, credential=credential)
+                )
+            return self._project_client
+    
+    async def get_agent(self, agent_id: str, tools: list | tuple) -> ChatAgent:
+        """
+        Return the ChatAgent for a Foundry agent ID, creating it on first use.
+        
+        Different agents are opened concurrently; callers asking for the
+        same agent share a single open.
+        """
+        opening = self._agents.get(agent_id)
+        if opening is None:
+            opening = self._agents[agent_id] = asyncio.create_task(self._open_agent(agent_id, tools))
+        try:
+            # Shielded so one cancelled caller does not abort the open for the rest
+            return await asyncio.shield(opening)
+        except Exception:
+            if self._agents.get(agent_id) is opening:
+                del self._agents[agent_id]  # Let the next caller retry
+            raise
+    
+    async def _open_agent(self, agent_id: str, tools: list | tuple) -> ChatAgent:
+        from agent_framework.azure import AzureAIAgentClient
+        
+        project_client = await self.project_client()
+        return await self._stack.enter_async_context(ChatAgent(
+            chat_client=AzureAIAgentClient(
+                project_client=project_client,
+                agent_id=agent_id,
+            ),
+            tools=tools if tools else None,
+        ))
+    
+    async def aclose(self) -> None:
+        for opening in self._agents.values():
+            opening.cancel()
+        self._agents.clear()
+        self._project_client = None
+        await self._stack.aclose()
+
+
+# One session per event loop; the async clients are bound to the loop
+# they were created on
+_SESSIONS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _FoundrySession]" = weakref.WeakKeyDictionary()
+
+
+def _foundry_session() -> _FoundrySession:
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None:
+        session = _SESSIONS[loop] = _FoundrySession()
+    return session
+
+
+async def close_foundry_clients() -> None:
+    """Close the Foundry clients and agents cached for the running event loop."""
+    session = _SESSIONS.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.aclose()
 
 
 # =============================================================================
 # Workflow Executors
 # =============================================================================
 
+_FINDING_SCHEMA = '{"code": "...", "title": "...", "description": "...", "severity": "low|medium|high|critical", "confidence": "low|medium|high", "evidence": [...]}'
+
+
+def _declaration_body(declaration: dict[str, Any]) -> str:
+    """Describe one declaration as the variable middle of a prompt."""
+    if "shipper" in declaration:
+        shipper = declaration["shipper"]
+        if isinstance(shipper, dict):
+            shipper_block = (
+                f"Shipper: {shipper.get('name', 'N/A')} ({shipper.get('country', 'N/A')})\n"
+                f"Shipper Address: {shipper.get('address', 'N/A')}\n"
+            )
+        else:
+            shipper_block = f"Shipper: {shipper}\n"
+    else:
+        shipper_block = ""
+    
+    if "consignee" in declaration or "receiver" in declaration:
+        consignee = declaration.get("consignee") or declaration.get("receiver")
+        if isinstance(consignee, dict):
+            consignee_block = f"Consignee: {consignee.get('name', 'N/A')} ({consignee.get('country', 'N/A')})\n"
+        else:
+            consignee_block = f"Consignee: {consignee}\n"
+    else:
+        consignee_block = ""
+    
+    if "goods" in declaration:
+        # One formatted block per line item, joined in a single pass
+        goods_block = "\nGoods:\n" + "".join(
+            f"  {i}. {good.get('description', 'N/A')}\n"
+            f"     HS Code: {good.get('hs_code', 'N/A')}\n"
+            f"     Value: {good.get('unit_value', 'N/A')} x {good.get('quantity', 'N/A')} = {good.get('total_value', 'N/A')} {good.get('currency', '')}\n"
+            f"     Origin: {good.get('country_of_origin', 'N/A')}\n"
+            for i, good in enumerate(declaration["goods"], 1)
+        )
+    elif "goods_description" in declaration:
+        goods_block = (
+            f"Goods: {declaration['goods_description']}\n"
+            f"HS Code: {declaration.get('hs_code', 'N/A')}\n"
+            f"Value: {declaration.get('declared_value', 'N/A')}\n"
+            f"Origin: {declaration.get('country_of_origin', 'N/A')}\n"
+        )
+    else:
+        goods_block = ""
+    
+    return (
+        f"{shipper_block}{consignee_block}{goods_block}"
+        f"\nCountry of Dispatch: {declaration.get('country_of_dispatch', 'N/A')}\n"
+        f"Destination: {declaration.get('destination_country', declaration.get('port_of_entry', 'N/A'))}\n"
+        f"Total Value: {declaration.get('total_value', 'N/A')} {declaration.get('currency', '')}\n"
+        f"Transport Mode: {declaration.get('transport_mode', 'N/A')}"
+    )
+
+
+# Fixed text around the per-declaration details
+_PROMPT_HEAD = "Analyze this customs declaration for compliance issues:\n\n"
+_PROMPT_TAIL = '\n\n\nProvide your analysis as JSON:\n{"findings": [' + _FINDING_SCHEMA + ']}'
+_BATCH_PROMPT_TAIL = (
+    "\n\n\nProvide your analysis as JSON, with one entry per declaration:\n"
+    '{"results": [{"declaration": 1, "findings": [' + _FINDING_SCHEMA + ']}, ...]}'
+)
+
+
+def format_declaration(declaration: dict[str, Any]) -> str:
+    """Build the agent prompt for a declaration."""
+    return _PROMPT_HEAD + _declaration_body(declaration) + _PROMPT_TAIL
+
+
+def format_declaration_batch(declarations: list[dict[str, Any]]) -> str:
+    """Build one agent prompt covering several declarations."""
+    parts = [
+        f"Analyze each of these {len(declarations)} customs declarations for compliance issues.",
+        "Assess every declaration independently.",
+    ]
+    for i, declaration in enumerate(declarations, 1):
+        parts.append(f"\n=== DECLARATION {i} ===")
+        parts.append(_declaration_body(declaration))
+    
+    return "\n".join(parts) + _BATCH_PROMPT_TAIL
+
+
 class DeclarationDispatcher(Executor):
-    """Dispatcher that fans out the declaration to all compliance agents."""
+    """
+    Dispatcher that fans out the declaration to all compliance agents.
+    
+    The prompt is formatted once here and sent alongside the declaration,
+    so the agent executors share it instead of each rebuilding it.
+    """
 
     @handler
     async def handle(self, declaration: dict[str, Any], ctx: WorkflowContext[dict[str, Any]]) -> None:
         if not declaration:
             raise RuntimeError("Declaration data is required")
-        await ctx.send_message(declaration)
+        await ctx.send_message({
+            "declaration": declaration,
+            "prompt": format_declaration(declaration),
+        })
+    
+    @handler
+    async def handle_batch(self, batch: DeclarationBatch, ctx: WorkflowContext[dict[str, Any]]) -> None:
+        if not batch.declarations:
+            raise RuntimeError("Declaration data is required")
+        await ctx.send_message({
+            "declarations": batch.declarations,
+            "prompt": format_declaration_batch(batch.declarations),
+            "batch_size": len(batch.declarations),
+        })
 
 
-class ComplianceResultAggregator(Executor):
-    """Aggregator that collects results from all agents (fan-in)."""
+# (overall_risk, requires_manual_review) indexed by the bits
+# critical > 0 | high > 0 | medium > 1 | any medium or low finding;
+# the highest set bit decides
+_RISK_TABLE = tuple(
+    ("critical", True) if bits & 8 else
+    ("high", True) if bits & 4 else
+    ("medium", True) if bits & 2 else
+    ("low", False) if bits & 1 else
+    ("clear", False)
+    for bits in range(16)
+)
 
-    @handler
-    async def handle(
-        self, 
-        results: list[AgentResult], 
-        ctx: WorkflowContext[Never, ComplianceReport]
-    ) -> None:
-        all_findings: list[Finding] = []
-        total_time = 0
-        
-        for result in results:
-            all_findings.extend(result.findings)
-            total_time += result.processing_time_ms
-        
-        # Count by severity
-        critical = sum(1 for f in all_findings if f.severity == Severity.CRITICAL)
-        high = sum(1 for f in all_findings if f.severity == Severity.HIGH)
-        medium = sum(1 for f in all_findings if f.severity == Severity.MEDIUM)
-        low = sum(1 for f in all_findings if f.severity == Severity.LOW)
-        info = sum(1 for f in all_findings if f.severity == Severity.INFO)
+
+# Severities that trigger an agent-specific recommendation
+_ESCALATING_SEVERITIES = frozenset({Severity.CRITICAL, Severity.HIGH})
+
+# Recommendation per agent with a high or critical finding, in report order
+_AGENT_RECOMMENDATIONS = {
+    "CountryRestrictionsAgent": "Escalate to sanctions compliance officer for review",
+    "HSCodeValidationAgent": "Verify HS code classification with tariff specialist",
+    "ControlledGoodsAgent": "Check export license requirements before clearance",
+    "CountryOfOriginAgent": "Request additional origin documentation from shipper",
+    "ValueReasonablenessAgent": "Verify declared value against commercial invoices",
+}
+
+# Leading recommendation for the overall risk levels that block clearance
+_RISK_RECOMMENDATIONS = {
+    "critical": "HOLD: Do not release shipment pending investigation",
+    "high": "Requires supervisor approval before clearance",
+}
+
+
+def _fallback_declaration_id(now: datetime, position: Optional[int] = None) -> str:
+    """ID for a declaration without one; position (1-based) keeps batch entries apart."""
+    stamp = f"decl-{now:%Y%m%d%H%M%S}"
+    return stamp if position is None else f"{stamp}-{position}"
+
+
+class _ReportBuilder:
+    """Running totals for one declaration's report, fed one AgentResult at a time."""
+    
+    __slots__ = ("declaration_id", "position", "results", "total_time", "counts", "escalated_agents")
+    
+    def __init__(self, declaration_id: Optional[str] = None, position: Optional[int] = None):
+        self.declaration_id = declaration_id
+        # Position in the submitted batch, used in the fallback ID
+        self.position = position
+        self.results: list[AgentResult] = []
+        self.total_time = 0
+        # Findings per severity, indexed by Severity.rank
+        self.counts = [0] * len(Severity)
+        # Agents with a high or critical finding
+        self.escalated_agents: set[str] = set()
+    
+    def add(self, result: AgentResult) -> None:
+        self.results.append(result)
+        self.total_time += result.processing_time_ms
+        for f in result.findings:
+            self.counts[f.severity.rank] += 1
+            if f.severity in _ESCALATING_SEVERITIES:
+                self.escalated_agents.add(f.agent)
+    
+    def build(self) -> ComplianceReport:
+        info, low, medium, high, critical = self.counts
         
         # Determine risk level
-        if critical > 0:
-            overall_risk = "critical"
-            requires_review = True
-        elif high > 0:
-            overall_risk = "high"
-            requires_review = True
-        elif medium > 1:
-            overall_risk = "medium"
-            requires_review = True
-        elif medium > 0 or low > 0:
-            overall_risk = "low"
-            requires_review = False
-        else:
-            overall_risk = "clear"
-            requires_review = False
+        overall_risk, requires_review = _RISK_TABLE[
+            (critical > 0) << 3 | (high > 0) << 2 | (medium > 1) << 1 | (medium > 0 or low > 0)
+        ]
         
-        recommendations = self._generate_recommendations(all_findings, overall_risk)
+        recommendations = self._generate_recommendations(self.escalated_agents, overall_risk)
+        now = datetime.now(timezone.utc)
         
-        report = ComplianceReport(
-            declaration_id=f"decl-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}",
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            agent_results=results,
-            total_findings=len(all_findings),
+        return ComplianceReport(
+            declaration_id=self.declaration_id or _fallback_declaration_id(now, self.position),
+            timestamp=now.isoformat().replace("+00:00", "Z"),
+            agent_results=list(self.results),
+            total_findings=sum(self.counts),
             critical_count=critical,
             high_count=high,
             medium_count=medium,
@@ -538,184 +1006,325 @@ class ComplianceResultAggregator(Executor):
             info_count=info,
             overall_risk=overall_risk,
             requires_manual_review=requires_review,
-            processing_time_ms=total_time,
+            processing_time_ms=self.total_time,
             recommendations=recommendations,
         )
-        
-        await ctx.yield_output(report)
     
-    def _generate_recommendations(self, findings: list[Finding], risk: str) -> list[str]:
-        recommendations = []
-        agents_with_issues = set(f.agent for f in findings if f.severity in [Severity.CRITICAL, Severity.HIGH])
-        
-        if "CountryRestrictionsAgent" in agents_with_issues:
-            recommendations.append("Escalate to sanctions compliance officer for review")
-        if "HSCodeValidationAgent" in agents_with_issues:
-            recommendations.append("Verify HS code classification with tariff specialist")
-        if "ControlledGoodsAgent" in agents_with_issues:
-            recommendations.append("Check export license requirements before clearance")
-        if "CountryOfOriginAgent" in agents_with_issues:
-            recommendations.append("Request additional origin documentation from shipper")
-        if "ValueReasonablenessAgent" in agents_with_issues:
-            recommendations.append("Verify declared value against commercial invoices")
+    @staticmethod
+    def _generate_recommendations(agents_with_issues: set[str], risk: str) -> list[str]:
+        recommendations = [
+            rec for agent, rec in _AGENT_RECOMMENDATIONS.items() if agent in agents_with_issues
+        ]
         
-        if risk == "critical":
-            recommendations.insert(0, "HOLD: Do not release shipment pending investigation")
-        elif risk == "high":
-            recommendations.insert(0, "Requires supervisor approval before clearance")
+        prefix = _RISK_RECOMMENDATIONS.get(risk)
+        if prefix:
+            recommendations.insert(0, prefix)
         
         return recommendations
 
 
+class ComplianceProgressEvent(WorkflowEvent):
+    """Interim ComplianceReport emitted by the aggregator as each agent reports."""
+
+
+class ComplianceResultAggregator(Executor):
+    """
+    Aggregator that collects results from all agents (fan-in).
+    
+    Results are folded in as each agent finishes rather than after the
+    slowest one: every arrival updates the running counts and emits a
+    ComplianceProgressEvent snapshot, and the final report is yielded once
+    all expected agents have reported.
+    """
+    
+    def __init__(self, expected: int, declaration_id: Optional[str] = None, id: str | None = None):
+        super().__init__(id=id or "aggregator")
+        self._remaining = expected
+        self._report = _ReportBuilder(declaration_id)
+
+    @handler
+    async def handle(
+        self, 
+        result: AgentResult, 
+        ctx: WorkflowContext[Never, ComplianceReport]
+    ) -> None:
+        self._report.add(result)
+        self._remaining -= 1
+        
+        report = self._report.build()
+        if self._remaining > 0:
+            await ctx.add_event(ComplianceProgressEvent(data=report))
+        else:
+            await ctx.yield_output(report)
+
+
+class BatchResultAggregator(Executor):
+    """
+    Aggregator for a DeclarationBatch: each agent sends one AgentResult per
+    declaration, and one ComplianceReport per declaration is yielded, in
+    batch order, once all expected agents have reported.
+    """
+    
+    def __init__(
+        self,
+        expected: int,
+        declarations: list[dict[str, Any]],
+        first_position: int = 1,
+        id: str | None = None,
+    ):
+        super().__init__(id=id or "aggregator")
+        self._remaining = expected
+        self._reports = [
+            _ReportBuilder(d.get("declaration_id"), position)
+            for position, d in enumerate(declarations, first_position)
+        ]
+
+    @handler
+    async def handle(
+        self, 
+        results: list[AgentResult], 
+        ctx: WorkflowContext[Never, list[ComplianceReport]]
+    ) -> None:
+        for report, result in zip(self._reports, results):
+            report.add(result)
+        self._remaining -= 1
+        
+        if self._remaining == 0:
+            await ctx.yield_output([report.build() for report in self._reports])
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(text: str, key: str) -> Optional[dict]:
+    """
+    Find the JSON object in an agent response, or None if there is none.
+    
+    The outermost {...} span is tried first, which covers the usual reply
+    (the object alone, or wrapped in prose or a code fence). If prose
+    around it also contains braces, each '{' is tried in turn with
+    raw_decode, which stops at the end of the first complete value; the
+    first object holding ``key`` wins, else the first object found.
+    """
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end < start:
+        return None
+    
+    try:
+        data = _json_loads(text[start:end + 1])
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+    
+    first = None
+    while start != -1 and start < end:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(data, dict):
+                if key in data:
+                    return data
+                if first is None:
+                    first = data
+        except ValueError:
+            pass
+        start = text.find('{', start + 1)
+    return first
+
+
 class FoundryAgentExecutor(Executor):
     """
     Executor that wraps an Azure AI Foundry persistent agent.
     
-    This executor uses an existing agent by ID from Azure AI Foundry.
+    This executor uses an existing agent by ID from Azure AI Foundry; with
+    no ID it reports the check as not run.
     """
     
     def __init__(
         self,
         agent_name: str,
-        agent_id: str,
-        project_client: AIProjectClient,
-        tools: list | None = None,
+        agent_id: Optional[str],
+        tools: list | tuple = (),
         id: str | None = None,
     ):
         super().__init__(id=id or agent_name.lower().replace("agent", "").replace(" ", "_"))
         self.agent_name = agent_name
         self.agent_id = agent_id
-        self.project_client = project_client
-        self.tools = tools or []
-        self._agent = None
+        self.tools = tools or ()
     
     @handler
-    async def handle(self, declaration: dict[str, Any], ctx: WorkflowContext[AgentResult]) -> None:
-        import time
-        start = time.time()
+    async def handle(self, message: dict[str, Any], ctx: WorkflowContext[AgentResult | list[AgentResult]]) -> None:
+        await ctx.send_message(await self.analyze(message))
+    
+    async def analyze(self, message: dict[str, Any]) -> AgentResult | list[AgentResult]:
+        """Run the agent on a dispatcher message; failures become error results."""
+        start = time.perf_counter()
+        batch_size = message.get("batch_size")
+        # A batched prompt asks for one analysis per declaration
+        timeout = AGENT_TIMEOUT_SECONDS * (batch_size or 1)
         
         try:
-            # Create ChatAgent using the existing Foundry agent
-            async with ChatAgent(
-                chat_client=AzureAIAgentClient(
-                    project_client=self.project_client,
-                    agent_id=self.agent_id,
-                ),
-                tools=self.tools if self.tools else None,
-            ) as agent:
-                # Format and run
-                prompt = self._format_declaration(declaration)
-                result = await agent.run(prompt)
-                
-                # Parse findings
-                findings = self._parse_findings(result.text if hasattr(result, 'text') else str(result))
-                
+            if self.agent_id is None:
+                raise RuntimeError(f"No Foundry agent ID for {self.agent_name}; run workflow.py --create")
+            
+            # Reuse the ChatAgent for this Foundry agent across runs
+            session = _foundry_session()
+            agent = await session.get_agent(self.agent_id, self.tools)
+            
+            # Run with the prompt formatted by the dispatcher
+            async with session.agent_slots:
+                result = await asyncio.wait_for(agent.run(message["prompt"]), timeout=timeout)
+            
+            response_text = getattr(result, 'text', None)
+            if response_text is None:
+                response_text = str(result)
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            
+            # Parse findings
+            if batch_size:
+                agent_result = [
+                    AgentResult(
+                        agent_name=self.agent_name,
+                        findings=findings,
+                        processing_time_ms=elapsed_ms,
+                    )
+                    if findings is not None
+                    else self._error_result(f"No result returned for declaration {i}", start)
+                    for i, findings in enumerate(self._parse_batch_findings(response_text, batch_size), 1)
+                ]
+            else:
                 agent_result = AgentResult(
                     agent_name=self.agent_name,
-                    findings=findings,
-                    processing_time_ms=int((time.time() - start) * 1000),
+                    findings=self._parse_findings(response_text),
+                    processing_time_ms=elapsed_ms,
                 )
+        except asyncio.TimeoutError:
+            agent_result = self._error_result(f"Timed out after {timeout:g}s", start, batch_size)
         except Exception as e:
-            agent_result = AgentResult(
-                agent_name=self.agent_name,
-                findings=[],
-                processing_time_ms=int((time.time() - start) * 1000),
-                error=str(e),
-            )
+            agent_result = self._error_result(str(e), start, batch_size)
         
-        await ctx.send_message(agent_result)
+        return agent_result
     
-    def _format_declaration(self, declaration: dict[str, Any]) -> str:
-        parts = ["Analyze this customs declaration for compliance issues:\n"]
-        
-        if "shipper" in declaration:
-            shipper = declaration["shipper"]
-            if isinstance(shipper, dict):
-                parts.append(f"Shipper: {shipper.get('name', 'N/A')} ({shipper.get('country', 'N/A')})")
-                parts.append(f"Shipper Address: {shipper.get('address', 'N/A')}")
-            else:
-                parts.append(f"Shipper: {shipper}")
-        
-        if "consignee" in declaration or "receiver" in declaration:
-            consignee = declaration.get("consignee") or declaration.get("receiver")
-            if isinstance(consignee, dict):
-                parts.append(f"Consignee: {consignee.get('name', 'N/A')} ({consignee.get('country', 'N/A')})")
-            else:
-                parts.append(f"Consignee: {consignee}")
-        
-        if "goods" in declaration:
-            parts.append("\nGoods:")
-            for i, good in enumerate(declaration["goods"], 1):
-                parts.append(f"  {i}. {good.get('description', 'N/A')}")
-                parts.append(f"     HS Code: {good.get('hs_code', 'N/A')}")
-                parts.append(f"     Value: {good.get('unit_value', 'N/A')} x {good.get('quantity', 'N/A')} = {good.get('total_value', 'N/A')} {good.get('currency', '')}")
-                parts.append(f"     Origin: {good.get('country_of_origin', 'N/A')}")
-        elif "goods_description" in declaration:
-            parts.append(f"Goods: {declaration['goods_description']}")
-            parts.append(f"HS Code: {declaration.get('hs_code', 'N/A')}")
-            parts.append(f"Value: {declaration.get('declared_value', 'N/A')}")
-            parts.append(f"Origin: {declaration.get('country_of_origin', 'N/A')}")
-        
-        parts.append(f"\nCountry of Dispatch: {declaration.get('country_of_dispatch', 'N/A')}")
-        parts.append(f"Destination: {declaration.get('destination_country', declaration.get('port_of_entry', 'N/A'))}")
-        parts.append(f"Total Value: {declaration.get('total_value', 'N/A')} {declaration.get('currency', '')}")
-        parts.append(f"Transport Mode: {declaration.get('transport_mode', 'N/A')}")
-        
-        parts.append("\n\nProvide your analysis as JSON:")
-        parts.append('{"findings": [{"code": "...", "title": "...", "description": "...", "severity": "low|medium|high|critical", "confidence": "low|medium|high", "evidence": [...]}]}')
-        
-        return "\n".join(parts)
+    def _error_result(
+        self,
+        error: str,
+        start: float,
+        batch_size: Optional[int] = None
+    ) -> AgentResult | list[AgentResult]:
+        # Surface the failure as a finding so the aggregated risk does not
+        # read as clear when a check could not run
+        result = AgentResult(
+            agent_name=self.agent_name,
+            findings=[Finding(
+                code="AGENT_ERROR",
+                title=f"{self.agent_name} did not complete",
+                description=error,
+                severity=Severity.HIGH,
+                confidence=Confidence.HIGH,
+                agent=self.agent_name,
+            )],
+            processing_time_ms=int((time.perf_counter() - start) * 1000),
+            error=error,
+        )
+        return [result] * batch_size if batch_size else result
     
     def _parse_findings(self, response_text: str) -> list[Finding]:
-        findings = []
-        
-        try:
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response_text)
-            if json_match:
-                data = json.loads(json_match.group())
-                
-                for f in data.get("findings", []):
-                    try:
-                        findings.append(Finding(
-                            code=f.get("code", "UNKNOWN"),
-                            title=f.get("title", "Finding"),
-                            description=f.get("description", ""),
-                            severity=Severity(f.get("severity", "medium").lower()),
-                            confidence=Confidence(f.get("confidence", "medium").lower()),
-                            evidence=f.get("evidence", []),
-                            metadata=f.get("metadata", {}),
-                            agent=self.agent_name,
-                        ))
-                    except ValueError:
-                        findings.append(Finding(
-                            code=f.get("code", "UNKNOWN"),
-                            title=f.get("title", "Finding"),
-                            description=f.get("description", ""),
-                            severity=Severity.MEDIUM,
-                            confidence=Confidence.MEDIUM,
-                            evidence=f.get("evidence", []),
-                            metadata=f.get("metadata", {}),
-                            agent=self.agent_name,
-                        ))
-        except (json.JSONDecodeError, ValueError):
-            if response_text.strip():
-                findings.append(Finding(
-                    code="ANALYSIS_COMPLETE",
-                    title=f"{self.agent_name} Analysis",
-                    description=response_text[:500],
-                    severity=Severity.INFO,
-                    confidence=Confidence.LOW,
-                    agent=self.agent_name,
-                ))
+        data = _extract_json_object(response_text, "findings")
+        if data is None:
+            return self._summary_finding(response_text)
+        return self._build_findings(data.get("findings", []))
+    
+    def _parse_batch_findings(self, response_text: str, count: int) -> list[Optional[list[Finding]]]:
+        """
+        Split a batched response into findings per declaration, in batch
+        order. Declarations the response left out come back as None; a
+        response with no parsable JSON is summarized for every declaration.
+        """
+        data = _extract_json_object(response_text, "results")
+        if data is None:
+            return [self._summary_finding(response_text)] * count
         
-        return findings
+        results = data.get("results")
+        per_declaration: list[Optional[list[Finding]]] = [None] * count
+        for position, entry in enumerate(results if isinstance(results, list) else (), 1):
+            if not isinstance(entry, dict):
+                continue  # Malformed entry: its declaration is reported as missing
+            index = entry.get("declaration", position)
+            if isinstance(index, int) and 1 <= index <= count:
+                per_declaration[index - 1] = self._build_findings(entry.get("findings", []))
+        return per_declaration
+    
+    def _build_findings(self, items: list[dict]) -> list[Finding]:
+        return [
+            Finding(
+                code=f.get("code", "UNKNOWN"),
+                title=f.get("title", "Finding"),
+                description=f.get("description", ""),
+                severity=_lookup_member(_SEVERITY_BY_VALUE, f.get("severity"), Severity.MEDIUM),
+                confidence=_lookup_member(_CONFIDENCE_BY_VALUE, f.get("confidence"), Confidence.MEDIUM),
+                evidence=f.get("evidence", []),
+                metadata=f.get("metadata", {}),
+                agent=self.agent_name,
+            )
+            for f in items
+            if isinstance(f, dict)
+        ]
+    
+    def _summary_finding(self, response_text: str) -> list[Finding]:
+        """Wrap a response that carried no parsable findings as one INFO finding."""
+        if not response_text.strip():
+            return []
+        return [Finding(
+            code="ANALYSIS_COMPLETE",
+            title=f"{self.agent_name} Analysis",
+            description=response_text[:500],
+            severity=Severity.INFO,
+            confidence=Confidence.LOW,
+            agent=self.agent_name,
+        )]
 
 
 # =============================================================================
 # Main Workflow
 # =============================================================================
 
+# In-flight compliance checks keyed by a digest of their inputs, per event
+# loop like _SESSIONS: a task can only be awaited on the loop running it
+_INFLIGHT: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+# Stream event types the run loops act on; everything else is ignored
+_STREAM_EVENT_TYPES = (AgentResponseUpdate, ComplianceProgressEvent, WorkflowOutputEvent)
+
+
+class _StreamEventKinds(dict):
+    """
+    Concrete event class -> the _STREAM_EVENT_TYPES entry it is handled as.
+    
+    Lookups are a plain subscript on type(event); a class seen for the
+    first time is resolved through issubclass and remembered, so
+    subclasses are still handled as their base type.
+    """
+    
+    def __missing__(self, cls: type) -> Optional[type]:
+        kind = next((t for t in _STREAM_EVENT_TYPES if issubclass(cls, t)), None)
+        self[cls] = kind
+        return kind
+
+
+_STREAM_EVENT_KINDS = _StreamEventKinds({t: t for t in _STREAM_EVENT_TYPES})
+
+
+def _check_key(declaration_data: dict[str, Any], agent_ids: dict[str, str] | None) -> str:
+    """Digest a declaration (and agent IDs) independently of key order."""
+    payload = {"declaration": declaration_data, "agent_ids": agent_ids}
+    if orjson:
+        data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        data = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
 async def run_compliance_check(
     declaration_data: dict[str, Any],
     agent_ids: dict[str, str] | None = None,
@@ -723,6 +1332,11 @@ async def run_compliance_check(
     """
     Run a compliance check using Azure AI Foundry persistent agents.
     
+    Concurrent calls for the same declaration on the same event loop share
+    one run instead of each fanning out to every agent. They all receive
+    the same ComplianceReport object, so treat it as read-only (use
+    dataclasses.replace() or a copy to change it).
+    
     Args:
         declaration_data: The customs declaration to analyze
         agent_ids: Optional dict mapping agent names to Foundry agent IDs.
@@ -731,70 +1345,265 @@ async def run_compliance_check(
     Returns:
         ComplianceReport with aggregated findings from all agents
     """
-    # Initialize reference services for tools
-    try:
-        from app.services.hs_code_reference import HSCodeReferenceService
-        from app.services.sanctions_reference import SanctionsReferenceService
-        
-        hs_service = HSCodeReferenceService()
-        sanctions_service = SanctionsReferenceService()
-        initialize_services(hs_service, sanctions_service)
-    except Exception as e:
-        print(f"Warning: Could not initialize reference services: {e}")
+    key = _check_key(declaration_data, agent_ids)
+    loop = asyncio.get_running_loop()
+    inflight = _INFLIGHT.get(loop)
+    if inflight is None:
+        inflight = _INFLIGHT[loop] = {}
+    task = inflight.get(key)
+    if task is None:
+        task = loop.create_task(_run_compliance_check(declaration_data, agent_ids))
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # Shield so one caller being cancelled does not cancel the shared run
+    return await asyncio.shield(task)
+
+
+async def _prepare_run(agent_ids: dict[str, str] | None) -> dict[str, str]:
+    """Reset per-run tool state, initialize services and resolve agent IDs."""
+    from tools import begin_run, initialize_services, services_initialized
+    
+    # Fresh sanctions screening cache for this run
+    begin_run()
+    
+    # Initialize reference services for tools (once per process)
+    if not services_initialized():
+        try:
+            from app.services.hs_code_reference import HSCodeReferenceService
+            from app.services.sanctions_reference import SanctionsReferenceService
+            
+            # Construct both off the event loop and in parallel
+            hs_service, sanctions_service = await asyncio.gather(
+                asyncio.to_thread(HSCodeReferenceService),
+                asyncio.to_thread(SanctionsReferenceService),
+            )
+            initialize_services(hs_service, sanctions_service)
+        except Exception as e:
+            logger.warning("Could not initialize reference services: %s", e)
     
     # Get or create agent IDs
     if agent_ids is None:
-        if os.path.exists(AGENT_IDS_FILE):
-            with open(AGENT_IDS_FILE, 'r') as f:
-                agent_ids = json.load(f)
-        else:
+        agent_ids = _cached_agent_ids()
+        if agent_ids is None:
             agent_ids = await create_foundry_agents()
     
-    async with (
-        AzureCliCredential() as credential,
-        AIProjectClient(endpoint=AZURE_AI_PROJECT_ENDPOINT, credential=credential) as project_client,
-    ):
-        # Create executors
-        dispatcher = DeclarationDispatcher(id="dispatcher")
-        aggregator = ComplianceResultAggregator(id="aggregator")
-        
-        # Create executor for each Foundry agent
-        agent_configs = get_agent_configs()
-        agent_executors = []
-        for name, config in agent_configs.items():
-            if name not in agent_ids:
-                print(f"Warning: No agent ID for {name}, skipping")
-                continue
-            
-            executor = FoundryAgentExecutor(
-                agent_name=name,
-                agent_id=agent_ids[name],
-                project_client=project_client,
-                tools=config.get("tools", []),
-            )
-            agent_executors.append(executor)
-        
-        # Build workflow with fan-out/fan-in pattern
-        workflow = (
-            WorkflowBuilder()
-            .set_start_executor(dispatcher)
-            .add_fan_out_edges(dispatcher, agent_executors)
-            .add_fan_in_edges(agent_executors, aggregator)
-            .build()
+    return agent_ids
+
+
+def _build_agent_executors(agent_ids: dict[str, str]) -> list[FoundryAgentExecutor]:
+    """
+    Create an executor for each configured Foundry agent.
+    
+    Agents without a known ID still get an executor, which reports an
+    AGENT_ERROR finding so the missing check cannot read as clear.
+    """
+    agent_configs = get_agent_configs()
+    agent_executors = [
+        FoundryAgentExecutor(
+            agent_name=name,
+            agent_id=agent_ids.get(name),
+            tools=resolve_local_tools(config),
         )
-        
-        # Run workflow
-        report: ComplianceReport | None = None
-        async for event in workflow.run_stream(declaration_data):
-            if isinstance(event, AgentResponseUpdate):
-                print(f"[{event.executor_id}] Processing...", end="\r", flush=True)
-            elif isinstance(event, WorkflowOutputEvent):
-                report = event.data
-        
-        if report is None:
-            raise RuntimeError("Workflow completed without producing a report")
-        
-        return report
+        for name, config in agent_configs.items()
+    ]
+    if len(agent_ids) < len(agent_configs):
+        for name in agent_configs:
+            if name not in agent_ids:
+                logger.warning("No agent ID for %s, reporting it as not run", name)
+    
+    return agent_executors
+
+
+def _build_workflow(agent_executors: list[FoundryAgentExecutor], aggregator: Executor):
+    # Build workflow with fan-out, then one edge per agent into the
+    # aggregator so each result is delivered as soon as it is ready
+    dispatcher = DeclarationDispatcher(id="dispatcher")
+    builder = (
+        WorkflowBuilder()
+        .set_start_executor(dispatcher)
+        .add_fan_out_edges(dispatcher, agent_executors)
+    )
+    for executor in agent_executors:
+        builder.add_edge(executor, aggregator)
+    return builder.build()
+
+
+async def _run_compliance_check(
+    declaration_data: dict[str, Any],
+    agent_ids: dict[str, str] | None,
+) -> ComplianceReport:
+    agent_ids = await _prepare_run(agent_ids)
+    agent_executors = _build_agent_executors(agent_ids)
+    if USE_DIRECT_FANOUT:
+        return await _run_direct(declaration_data, agent_executors)
+    
+    aggregator = ComplianceResultAggregator(
+        expected=len(agent_executors),
+        declaration_id=declaration_data.get("declaration_id"),
+        id="aggregator",
+    )
+    workflow = _build_workflow(agent_executors, aggregator)
+    
+    # Run workflow
+    logger.info("Running %d agents concurrently...", len(agent_executors))
+    report: ComplianceReport | None = None
+    trace = logger.isEnabledFor(logging.DEBUG)
+    async for event in workflow.run_stream(declaration_data):
+        kind = _STREAM_EVENT_KINDS[type(event)]
+        if kind is WorkflowOutputEvent:
+            report = event.data
+        elif not trace:
+            continue
+        elif kind is AgentResponseUpdate:
+            logger.debug("[%s] Processing...", event.executor_id)
+        elif kind is ComplianceProgressEvent:
+            interim = event.data
+            logger.debug("[aggregator] %d/%d agents reported, risk so far: %s",
+                         len(interim.agent_results), len(agent_executors), interim.overall_risk)
+    
+    if report is None:
+        raise RuntimeError("Workflow completed without producing a report")
+    
+    return report
+
+
+async def _run_direct(
+    declaration_data: dict[str, Any],
+    agent_executors: list[FoundryAgentExecutor],
+) -> ComplianceReport:
+    """
+    Fan out to the agents with a TaskGroup and aggregate inline, skipping
+    the workflow graph's per-message bookkeeping.
+    """
+    if not declaration_data:
+        raise RuntimeError("Declaration data is required")
+    if not agent_executors:
+        raise RuntimeError("Workflow completed without producing a report")
+    
+    message = {
+        "declaration": declaration_data,
+        "prompt": format_declaration(declaration_data),
+    }
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(executor.analyze(message)) for executor in agent_executors]
+    
+    report = _ReportBuilder(declaration_data.get("declaration_id"))
+    for task in tasks:
+        report.add(task.result())
+    return report.build()
+
+
+async def run_compliance_check_batch(
+    declarations: list[dict[str, Any]],
+    agent_ids: dict[str, str] | None = None,
+    batch_size: int = COMPLIANCE_BATCH_SIZE,
+) -> list[ComplianceReport]:
+    """
+    Run compliance checks for many declarations, sending up to batch_size
+    of them to each agent in a single prompt.
+    
+    This trades larger prompts for far fewer agent round trips when
+    declarations are queued up (e.g. batch reconciliation).
+    
+    Args:
+        declarations: The customs declarations to analyze
+        agent_ids: Optional dict mapping agent names to Foundry agent IDs
+        batch_size: Maximum declarations per agent prompt
+    
+    Returns:
+        One ComplianceReport per declaration, in input order
+    """
+    if not declarations:
+        return []
+    
+    # Resolve the agents and reference services once, not per chunk, so
+    # concurrent chunks never each create agents or start the services. The
+    # chunks inherit this context, so they share one screening cache.
+    agent_ids = await _prepare_run(agent_ids)
+    
+    size = max(batch_size, 1)
+    chunks = [(i + 1, declarations[i:i + size]) for i in range(0, len(declarations), size)]
+    reports = await asyncio.gather(*(
+        _run_batch(chunk, agent_ids, first) if len(chunk) > 1 else _single_report_list(chunk[0], agent_ids, first)
+        for first, chunk in chunks
+    ))
+    return [report for chunk_reports in reports for report in chunk_reports]
+
+
+async def _single_report_list(
+    declaration_data: dict[str, Any],
+    agent_ids: dict[str, str],
+    position: int,
+) -> list[ComplianceReport]:
+    report = await run_compliance_check(declaration_data, agent_ids)
+    if not declaration_data.get("declaration_id"):
+        # Copy rather than rename: the report may be shared with other callers
+        report = replace(report, declaration_id=_fallback_declaration_id(datetime.now(timezone.utc), position))
+    return [report]
+
+
+async def _run_batch(
+    declarations: list[dict[str, Any]],
+    agent_ids: dict[str, str],
+    first_position: int,
+) -> list[ComplianceReport]:
+    """Run one chunk of a batch with agents already resolved by the caller."""
+    agent_executors = _build_agent_executors(agent_ids)
+    aggregator = BatchResultAggregator(
+        expected=len(agent_executors),
+        declarations=declarations,
+        first_position=first_position,
+        id="aggregator",
+    )
+    workflow = _build_workflow(agent_executors, aggregator)
+    
+    logger.info("Running %d agents concurrently on %d declarations...", len(agent_executors), len(declarations))
+    reports: list[ComplianceReport] | None = None
+    trace = logger.isEnabledFor(logging.DEBUG)
+    async for event in workflow.run_stream(DeclarationBatch(declarations)):
+        kind = _STREAM_EVENT_KINDS[type(event)]
+        if kind is WorkflowOutputEvent:
+            reports = event.data
+        elif trace and kind is AgentResponseUpdate:
+            logger.debug("[%s] Processing...", event.executor_id)
+    
+    if reports is None:
+        raise RuntimeError("Workflow completed without producing reports")
+    
+    return reports
+
+
+# Sample declaration analyzed by the CLI
+_SAMPLE_DECLARATION = {
+    "declaration_id": "DEMO-001",
+    "shipper": {
+        "name": "Shenzhen Electronics Co., Ltd.",
+        "address": "123 Factory Road, Shenzhen",
+        "country": "CN"
+    },
+    "consignee": {
+        "name": "UK Import Ltd.",
+        "address": "45 Commerce Street, London",
+        "country": "GB"
+    },
+    "goods": [
+        {
+            "description": "LED Computer Monitors, 27 inch, 4K resolution",
+            "hs_code": "852852",
+            "quantity": 50,
+            "unit_value": 300.00,
+            "total_value": 15000.00,
+            "currency": "USD",
+            "country_of_origin": "CN"
+        }
+    ],
+    "country_of_dispatch": "CN",
+    "destination_country": "GB",
+    "port_of_entry": "Felixstowe",
+    "total_value": 15000.00,
+    "currency": "USD",
+    "transport_mode": "Sea",
+}
 
 
 async def main():
@@ -808,15 +1617,21 @@ async def main():
     
     args = parser.parse_args()
     
+    try:
+        await _run_cli(args)
+    finally:
+        await close_foundry_clients()
+
+
+async def _run_cli(args: argparse.Namespace) -> None:
     if args.cleanup:
         await cleanup_foundry_agents()
         return
     
     if args.list:
         print("Agents in Azure AI Foundry:")
-        agents = await list_foundry_agents()
-        for agent in agents:
-            print(f"  - {agent['name']} (ID: {agent['id']}, Model: {agent['model']})")
+        async for agent in list_foundry_agents():
+            print(f"  - {agent['name']}: {agent['description'] or 'No description'}")
         return
     
     if args.create or args.recreate:
@@ -833,43 +1648,11 @@ async def main():
         print("      Agents are visible in the Foundry portal and can be managed there.")
         print()
         
-        # Sample declaration
-        declaration = {
-            "declaration_id": "DEMO-001",
-            "shipper": {
-                "name": "Shenzhen Electronics Co., Ltd.",
-                "address": "123 Factory Road, Shenzhen",
-                "country": "CN"
-            },
-            "consignee": {
-                "name": "UK Import Ltd.",
-                "address": "45 Commerce Street, London",
-                "country": "GB"
-            },
-            "goods": [
-                {
-                    "description": "LED Computer Monitors, 27 inch, 4K resolution",
-                    "hs_code": "852852",
-                    "quantity": 50,
-                    "unit_value": 300.00,
-                    "total_value": 15000.00,
-                    "currency": "USD",
-                    "country_of_origin": "CN"
-                }
-            ],
-            "country_of_dispatch": "CN",
-            "destination_country": "GB",
-            "port_of_entry": "Felixstowe",
-            "total_value": 15000.00,
-            "currency": "USD",
-            "transport_mode": "Sea",
-        }
-        
         print("Analyzing declaration...")
-        print(json.dumps(declaration, indent=2))
+        print(_json_dumps_pretty(_SAMPLE_DECLARATION).decode())
         print()
         
-        report = await run_compliance_check(declaration)
+        report = await run_compliance_check(_SAMPLE_DECLARATION)
         
         print()
         print("=" * 70)
@@ -901,7 +1684,7 @@ async def main():
                 print(f"  ERROR: {agent_result.error}")
             else:
                 for finding in agent_result.findings:
-                    severity = finding.severity.value if hasattr(finding.severity, 'value') else str(finding.severity)
+                    severity = str(getattr(finding.severity, 'value', finding.severity))
                     print(f"  [{severity.upper()}] {finding.code}: {finding.title}")
         
         print()
@@ -909,4 +1692,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        import uvloop
+    except ImportError:  # uvloop is an optional speedup (not available on Windows)
+        uvloop = None
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        runner.run(main())
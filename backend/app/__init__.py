@@ -35,6 +35,11 @@ def create_app():
         app = Flask(__name__)
         logger.info("Running in development mode (no static files)")
     
+    # Serialize responses and parse request bodies with orjson when installed
+    from app.json_provider import OrjsonProvider, orjson
+    if orjson:
+        app.json = OrjsonProvider(app)
+    
     # Log configuration status
     from app.config import config
     logger.info(f"Azure Storage configured: {bool(config.AZURE_STORAGE_CONNECTION_STRING)}")
@@ -81,21 +86,27 @@ def create_app():
             'version': '1.0.0'
         })
     
+    # Configuration is fixed for the life of the process, so the status
+    # payload the frontend polls is built once
+    status = {
+        'azureConfigured': config.is_azure_configured(),
+        'openaiConfigured': config.is_openai_configured(),
+        'cosmosConfigured': config.is_cosmos_configured(),
+        'services': {
+            'storage': bool(config.AZURE_STORAGE_CONNECTION_STRING),
+            'documentIntelligence': bool(config.AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT),
+            'openai': bool(config.AZURE_OPENAI_ENDPOINT),
+            'cosmosdb': bool(config.AZURE_COSMOS_ENDPOINT)
+        }
+    }
+    
     @app.route('/api/status', methods=['GET'])
     def api_status():
         """Return configuration status for frontend"""
-        return jsonify({
-            'azureConfigured': config.is_azure_configured(),
-            'openaiConfigured': config.is_openai_configured(),
-            'cosmosConfigured': config.is_cosmos_configured(),
-            'services': {
-                'storage': bool(config.AZURE_STORAGE_CONNECTION_STRING),
-                'documentIntelligence': bool(config.AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT),
-                'openai': bool(config.AZURE_OPENAI_ENDPOINT),
-                'cosmosdb': bool(config.AZURE_COSMOS_ENDPOINT)
-            }
-        })
+        return jsonify(status)
     
+    # Route modules import their Azure SDK services on first use, so loading
+    # every blueprint here does not pull the SDKs into each worker at startup
     from app.routes import upload, storage, ocr, transform, compliance, customs, cosmosdb, agents
     
     app.register_blueprint(upload.bp)
@@ -109,6 +120,14 @@ def create_app():
     
     # Serve React app for non-API routes (production only)
     if has_static:
+        # The production build does not change while the app runs, so index
+        # its files once instead of stat-ing the disk on every navigation
+        static_files = frozenset(
+            os.path.relpath(os.path.join(root, name), app.static_folder).replace(os.sep, '/')
+            for root, _, names in os.walk(app.static_folder)
+            for name in names
+        )
+        
         @app.route('/')
         def serve_root():
             return send_from_directory(app.static_folder, 'index.html')
@@ -116,8 +135,7 @@ def create_app():
         @app.route('/<path:path>')
         def serve_static(path):
             # Serve static file if it exists, otherwise return index.html for SPA routing
-            file_path = os.path.join(app.static_folder, path)
-            if os.path.isfile(file_path):
+            if path in static_files:
                 return send_from_directory(app.static_folder, path)
             return send_from_directory(app.static_folder, 'index.html')
     
@@ -3,6 +3,7 @@ Configuration Management
 Loads and validates environment variables
 """
 import os
+from functools import lru_cache
 from typing import Optional
 
 class Config:
@@ -30,7 +31,11 @@ class Config:
     FLASK_ENV: str = os.getenv('FLASK_ENV', 'development')
     FLASK_DEBUG: bool = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
+    # Settings are read from the environment once at import, so the derived
+    # checks below are computed on first call and then cached
+    
     @classmethod
+    @lru_cache(maxsize=None)
     def is_azure_configured(cls) -> bool:
         """Check if Azure services are properly configured"""
         return bool(
@@ -39,6 +44,7 @@ class Config:
         )
     
     @classmethod
+    @lru_cache(maxsize=None)
     def is_openai_configured(cls) -> bool:
         """Check if Azure OpenAI is properly configured"""
         return bool(
@@ -47,11 +53,13 @@ class Config:
         )
     
     @classmethod
+    @lru_cache(maxsize=None)
     def is_cosmos_configured(cls) -> bool:
         """Check if Azure Cosmos DB is properly configured"""
         return bool(cls.AZURE_COSMOS_ENDPOINT)
     
     @classmethod
+    @lru_cache(maxsize=None)
     def get_ocr_service_type(cls) -> str:
         """Determine which OCR service to use - Content Understanding preferred"""
         if cls.AZURE_CONTENT_UNDERSTANDING_ENDPOINT:
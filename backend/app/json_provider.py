@@ -0,0 +1,44 @@
+"""
+orjson-backed JSON Provider
+Serializes jsonify() responses and parses request bodies with orjson
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; Flask's provider is used without it
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider using orjson for compact responses and parsing.
+    
+    Output matches the default provider: keys are sorted, non-string keys
+    are coerced and dates go through Flask's default hook. Pretty-printed
+    debug responses and calls with extra json.dumps arguments fall back
+    to the standard library.
+    """
+    
+    def _options(self) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+    
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -13,11 +13,18 @@ Routes:
 """
 
 import asyncio
+import concurrent.futures
 import logging
 import os
 import sys
+import threading
 from flask import Blueprint, request, jsonify
 
+try:
+    import uvloop
+except ImportError:  # uvloop is an optional speedup (not available on Windows)
+    uvloop = None
+
 # Add agents module to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'agents'))
 
@@ -31,14 +38,40 @@ _sanctions_service = None
 _services_initialized = False
 
 
-def _run_async(coro):
-    """Run an async coroutine in a sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+# Background event loop shared by all requests, so the Foundry clients the
+# workflow caches per loop stay usable across requests
+_loop = None
+_loop_lock = threading.Lock()
+
+# Upper bound on how long a request waits for the background loop
+ROUTE_TIMEOUT_SECONDS = float(os.getenv("AGENT_ROUTE_TIMEOUT_SECONDS", "300"))
+
+
+def _get_loop():
+    """Return the background event loop, starting it on first use."""
+    global _loop
+    
+    with _loop_lock:
+        if _loop is None:
+            _loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='agents-loop', daemon=True).start()
+        return _loop
+
+
+def _run_async(coro, timeout: float = ROUTE_TIMEOUT_SECONDS):
+    """
+    Run an async coroutine in a sync context.
+    
+    The coroutine is cancelled if it has not finished within timeout
+    seconds, so a stuck Foundry call cannot hold the worker (or the shared
+    loop) indefinitely.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
     try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Agent operation timed out after {timeout:g}s") from None
 
 
 def _initialize_services():
@@ -102,6 +135,10 @@ def create_agents():
             'details': str(e)
         }), 500
     
+    except TimeoutError as e:
+        logger.error(f"❌ Failed to create agents: {e}")
+        return jsonify({'error': str(e)}), 504
+    
     except Exception as e:
         logger.error(f"❌ Failed to create agents: {e}")
         return jsonify({'error': str(e)}), 500
@@ -126,6 +163,10 @@ def cleanup_agents():
             'message': 'All agents have been removed from Azure AI Foundry'
         }), 200
     
+    except TimeoutError as e:
+        logger.error(f"❌ Failed to cleanup agents: {e}")
+        return jsonify({'error': str(e)}), 504
+    
     except Exception as e:
         logger.error(f"❌ Failed to cleanup agents: {e}")
         return jsonify({'error': str(e)}), 500
@@ -139,13 +180,20 @@ def list_agents():
     try:
         from workflow import list_foundry_agents
         
-        agents = _run_async(list_foundry_agents())
+        async def _collect():
+            return [agent async for agent in list_foundry_agents()]
+        
+        agents = _run_async(_collect())
         
         return jsonify({
             'agents': agents,
             'count': len(agents)
         }), 200
     
+    except TimeoutError as e:
+        logger.error(f"❌ Failed to list agents: {e}")
+        return jsonify({'error': str(e)}), 504
+    
     except Exception as e:
         logger.error(f"❌ Failed to list agents: {e}")
         return jsonify({'error': str(e)}), 500
@@ -242,6 +290,10 @@ def run_compliance_workflow():
             'details': str(e)
         }), 500
     
+    except TimeoutError as e:
+        logger.error(f"❌ Agent workflow failed: {e}")
+        return jsonify({'error': str(e)}), 504
+    
     except Exception as e:
         logger.error(f"❌ Agent workflow failed: {e}")
         import traceback
@@ -4,7 +4,6 @@ Handles LLM-based compliance checking
 """
 import logging
 from flask import Blueprint, request, jsonify
-from app.services.llm_client import get_llm_service
 from app.config import config
 
 logger = logging.getLogger('autonomousflow.compliance')
@@ -41,6 +40,7 @@ def validate_compliance():
         return jsonify({'error': 'structured_data required'}), 400
     
     try:
+        from app.services.llm_client import get_llm_service
         llm_service = get_llm_service()
         
         if not llm_service:
@@ -4,7 +4,6 @@ Handles storing processed customs declarations in Azure Cosmos DB
 """
 import logging
 from flask import Blueprint, request, jsonify
-from app.services.azure_cosmos import get_cosmos_service
 from app.config import config
 
 logger = logging.getLogger('autonomousflow.cosmosdb')
@@ -47,6 +46,7 @@ def store_declaration():
         }), 503
     
     try:
+        from app.services.azure_cosmos import get_cosmos_service
         cosmos_service = get_cosmos_service()
         
         if not cosmos_service:
@@ -93,6 +93,7 @@ def get_declaration(document_id: str):
         return jsonify({'error': 'Cosmos DB not configured'}), 503
     
     try:
+        from app.services.azure_cosmos import get_cosmos_service
         cosmos_service = get_cosmos_service()
         
         if not cosmos_service:
@@ -127,6 +128,7 @@ def list_declarations():
     try:
         limit = request.args.get('limit', 50, type=int)
         
+        from app.services.azure_cosmos import get_cosmos_service
         cosmos_service = get_cosmos_service()
         
         if not cosmos_service:
@@ -5,7 +5,6 @@ Extracts structured customs declaration fields directly from documents
 """
 import logging
 from flask import Blueprint, request, jsonify
-from app.services.azure_content_understanding import get_content_understanding_service
 from app.config import config
 
 logger = logging.getLogger('autonomousflow.ocr')
@@ -40,6 +39,7 @@ def analyze_document():
     
     try:
         # Use Content Understanding service (which uses Document Intelligence under the hood)
+        from app.services.azure_content_understanding import get_content_understanding_service
         ocr_service = get_content_understanding_service()
         service_name = "Azure Document Intelligence"
         
@@ -3,7 +3,6 @@ Azure Storage Routes
 Handles document storage in Azure Blob Storage
 """
 from flask import Blueprint, request, jsonify
-from app.services.azure_blob import get_blob_service
 from app.config import config
 
 bp = Blueprint('storage', __name__, url_prefix='/api/storage')
@@ -36,6 +35,7 @@ def upload_to_storage():
         return jsonify({'error': 'No file selected'}), 400
     
     try:
+        from app.services.azure_blob import get_blob_service
         blob_service = get_blob_service()
         
         if not blob_service:
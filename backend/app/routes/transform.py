@@ -4,7 +4,6 @@ Handles LLM-based transformation of raw OCR data to structured format
 """
 import logging
 from flask import Blueprint, request, jsonify
-from app.services.llm_client import get_llm_service
 from app.config import config
 
 logger = logging.getLogger('autonomousflow.transform')
@@ -40,6 +39,7 @@ def transform_data():
         return jsonify({'error': 'raw_data required'}), 400
     
     try:
+        from app.services.llm_client import get_llm_service
         llm_service = get_llm_service()
         
         if not llm_service:
@@ -6,7 +6,6 @@ import uuid
 import logging
 from flask import Blueprint, request, jsonify
 from werkzeug.utils import secure_filename
-from app.services.azure_blob import get_blob_service
 from app.config import config
 
 logger = logging.getLogger('autonomousflow.upload')
@@ -46,6 +45,7 @@ def upload_document():
         document_id = str(uuid.uuid4())
         
         # Try to upload to Azure Blob Storage
+        from app.services.azure_blob import get_blob_service
         blob_service = get_blob_service()
         if blob_service:
             logger.info("=" * 60)
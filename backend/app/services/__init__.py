@@ -3,8 +3,28 @@ Services Package
 Azure service integrations and LLM clients
 """
 
-from .hs_code_reference import HSCodeReferenceService
-from .sanctions_reference import SanctionsReferenceService
+from importlib import import_module
+
+# Resolved on first access (PEP 562) so that importing any one service
+# module does not pull in the Cosmos DB SDK through the reference services
+_LAZY_ATTRS = {
+    'HSCodeReferenceService': '.hs_code_reference',
+    'SanctionsReferenceService': '.sanctions_reference',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 __all__ = [
     'HSCodeReferenceService',
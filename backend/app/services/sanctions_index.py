@@ -0,0 +1,216 @@
+"""
+Sanctions Name Index
+
+In-memory token index over the sanctions list, used by
+SanctionsReferenceService to answer name searches without a CosmosDB
+round-trip per query.
+"""
+
+import re
+import unicodedata
+from array import array
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # rapidfuzz is optional; fuzzy screening is skipped without it
+    fuzz = process = None
+
+if TYPE_CHECKING:
+    from .sanctions_reference import SanctionedEntity
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Key under which a trie node stores its posting list
+_POSTINGS = ''
+
+# Token fragments are indexed up to this many characters; longer query
+# tokens are looked up by their leading characters and then verified
+_MAX_FRAGMENT = 6
+
+# Leading characters of each query token used to gather fuzzy candidates
+_FUZZY_PREFIX = 3
+
+# Legal forms and generic business words. They are shared by thousands of
+# listed names, so they are ignored when gathering and scoring fuzzy matches.
+_STOP_TOKENS = frozenset({
+    'ltd', 'limited', 'co', 'company', 'corp', 'corporation', 'inc', 'incorporated',
+    'llc', 'llp', 'lp', 'plc', 'gmbh', 'mbh', 'ag', 'kg', 'sa', 'sarl', 'sas', 'srl',
+    'spa', 'bv', 'nv', 'oy', 'ab', 'as', 'asa', 'jsc', 'ojsc', 'cjsc', 'pjsc', 'ao',
+    'oao', 'zao', 'ooo', 'pao', 'pte', 'pty', 'pvt', 'private', 'public', 'fze',
+    'fzco', 'fzc', 'est', 'establishment', 'trading', 'group', 'holding', 'holdings',
+    'international', 'intl', 'int', 'industries', 'industrial', 'enterprise',
+    'enterprises', 'the', 'and', 'of', 'for', 'de', 'del', 'la', 'le', 'und', 'et',
+})
+
+# Score cutoffs (0-100) for fuzzy matches in normal and strict screening
+FUZZY_CUTOFF = 85
+STRICT_FUZZY_CUTOFF = 90
+
+
+def normalize_name(text: str) -> str:
+    """Fold a name to lowercase ASCII tokens separated by single spaces."""
+    folded = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return ' '.join(_TOKEN_RE.findall(folded.lower()))
+
+
+def significant_tokens(key: str) -> str:
+    """Drop stop tokens and single characters from a normalized name."""
+    return ' '.join(t for t in key.split() if len(t) > 1 and t not in _STOP_TOKENS)
+
+
+class SanctionsNameIndex:
+    """
+    Token suffix trie over sanctioned entity names.
+    
+    Every suffix of every name token is inserted, and each trie node holds
+    the posting list (entity indices, ascending) of the entities passing
+    through it. Any fragment of a token therefore resolves to its candidate
+    entities in O(len(fragment)). Entity fields are kept in parallel lists
+    indexed by the same positions.
+    """
+    
+    def __init__(self, entities: Sequence['SanctionedEntity']):
+        self.entities: List['SanctionedEntity'] = list(entities)
+        self.keys: List[str] = [normalize_name(e.name) for e in self.entities]
+        self.entity_types: List[str] = [e.entity_type for e in self.entities]
+        self._trie: Dict[str, dict] = {}
+        
+        # Entries per regime code, tallied once at load
+        self.regime_counts: Counter = Counter(e.regime_code for e in self.entities if e.regime_code)
+        
+        # Lowercased address country / nationality value -> entity positions.
+        # There are only a few hundred distinct values, so substring queries
+        # scan the keys rather than the entities.
+        self._countries: Dict[str, array] = {}
+        for idx, entity in enumerate(self.entities):
+            for value in {entity.address_country.lower(), entity.nationality.lower()}:
+                if value:
+                    self._countries.setdefault(value, array('i')).append(idx)
+        
+        for idx, key in enumerate(self.keys):
+            for token in set(key.split()):
+                for start in range(len(token)):
+                    self._insert(token[start:start + _MAX_FRAGMENT], idx)
+    
+    def _insert(self, fragment: str, idx: int) -> None:
+        node = self._trie
+        for ch in fragment:
+            node = node.setdefault(ch, {})
+            postings = node.get(_POSTINGS)
+            if postings is None:
+                node[_POSTINGS] = array('i', (idx,))
+            elif postings[-1] != idx:
+                postings.append(idx)
+    
+    def __len__(self) -> int:
+        return len(self.entities)
+    
+    def _postings(self, fragment: str) -> Optional[array]:
+        node = self._trie
+        for ch in fragment:
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node.get(_POSTINGS)
+    
+    def _candidates(self, tokens: List[str]) -> Sequence[int]:
+        """Return the shortest posting list among the query tokens."""
+        best: Sequence[int] = ()
+        for token in tokens:
+            found = self._postings(token[:_MAX_FRAGMENT])
+            if not found:
+                return ()
+            if not best or len(found) < len(best):
+                best = found
+        return best
+    
+    def search(
+        self,
+        name: str,
+        max_results: int = 20,
+        entity_type: Optional[str] = None
+    ) -> List['SanctionedEntity']:
+        """
+        Find entities whose normalized name contains the normalized query.
+        
+        Matches the CONTAINS semantics of the CosmosDB query: the trie
+        narrows the search to the entities sharing the most selective query
+        token, and the candidates are then checked for containment.
+        """
+        query = normalize_name(name)
+        if not query:
+            return []
+        
+        results = []
+        for i in self._candidates(query.split()):
+            if query not in self.keys[i]:
+                continue
+            if entity_type and self.entity_types[i] != entity_type:
+                continue
+            results.append(self.entities[i])
+            if len(results) >= max_results:
+                break
+        return results
+    
+    def search_by_country(self, country: str, max_results: int = 50) -> List['SanctionedEntity']:
+        """
+        Find entities whose address country or nationality contains the
+        query (case-insensitive), in list order.
+        """
+        query = country.lower().strip()
+        matched = [postings for value, postings in self._countries.items() if query in value]
+        if not matched:
+            return []
+        indices = matched[0] if len(matched) == 1 else sorted(set().union(*matched))
+        return [self.entities[i] for i in indices[:max_results]]
+    
+    def fuzzy_search(
+        self,
+        name: str,
+        max_results: int = 20,
+        strict: bool = False
+    ) -> List[Tuple['SanctionedEntity', float]]:
+        """
+        Find entities whose names are similar to the query (spelling
+        variants, reordered words) using RapidFuzz.
+        
+        Legal forms and generic words (ltd, co, trading...) are ignored.
+        Candidates must share the leading or trailing characters of most
+        remaining query tokens; they are scored with token_sort_ratio, or plain ratio
+        in strict mode. Returns (entity, score) pairs, best first, or an
+        empty list when rapidfuzz is not installed.
+        """
+        if process is None:
+            return []
+        
+        tokens = significant_tokens(normalize_name(name)).split()
+        if not tokens:
+            return []
+        
+        # A query token is shared when its leading or trailing characters
+        # occur in a name token, so one typo does not lose the candidate
+        distinct = set(tokens)
+        hits: Counter = Counter()
+        for token in distinct:
+            shared = set()
+            for fragment in {token[:_FUZZY_PREFIX], token[-_FUZZY_PREFIX:]}:
+                found = self._postings(fragment)
+                if found:
+                    shared.update(found)
+            hits.update(shared)
+        required = len(distinct) - len(distinct) // 3
+        candidates = [i for i, count in hits.items() if count >= required]
+        if not candidates:
+            return []
+        
+        scorer, cutoff = (fuzz.ratio, STRICT_FUZZY_CUTOFF) if strict else (fuzz.token_sort_ratio, FUZZY_CUTOFF)
+        matches = process.extract(
+            ' '.join(tokens),
+            {i: significant_tokens(self.keys[i]) for i in candidates},
+            scorer=scorer,
+            score_cutoff=cutoff,
+            limit=max_results,
+        )
+        return [(self.entities[i], score) for _, score, i in matches]
@@ -7,19 +7,39 @@ Used by the Country Restrictions Agent for sanctions screening.
 
 import logging
 import os
+import sys
+import threading
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
 from azure.cosmos import CosmosClient
 from azure.identity import DefaultAzureCredential
 
+from .sanctions_index import SanctionsNameIndex
+
 logger = logging.getLogger(__name__)
 
 DATABASE_NAME = 'customs-workflow'
 CONTAINER_NAME = 'sanctions'
 
+# Serve name and country searches from an in-memory index of the whole list
+# (loaded on first use) instead of issuing a CONTAINS query per search
+USE_NAME_INDEX = os.getenv('SANCTIONS_NAME_INDEX', 'false').lower() == 'true'
+
+# Fuzzy hits below this relevance (after the country boost) are listed as
+# possible matches but do not count as a match
+FUZZY_MATCH_RELEVANCE = 0.8
+
+# Low-cardinality document fields repeated across thousands of entries.
+# They are interned when the whole list is loaded so each distinct value
+# is stored once.
+_CATEGORY_FIELDS = (
+    'entityType', 'regimeCode', 'regimeName', 'sanctionsImposed',
+    'nationality', 'addressCountry', 'designationType',
+)
+
 
-@dataclass
+@dataclass(slots=True)
 class SanctionedEntity:
     """Represents a sanctioned entity from the UK sanctions list"""
     unique_id: str
@@ -47,14 +67,25 @@ class SanctionsReferenceService:
     - Entity screening for compliance checks
     """
     
-    def __init__(self, cosmos_client: Optional[CosmosClient] = None):
+    def __init__(
+        self,
+        cosmos_client: Optional[CosmosClient] = None,
+        use_name_index: Optional[bool] = None
+    ):
         """
         Initialize the sanctions reference service.
         
         Args:
             cosmos_client: Optional pre-configured CosmosDB client.
                           If not provided, creates one using DefaultAzureCredential.
+            use_name_index: Answer name searches from an in-memory index.
+                           Defaults to the SANCTIONS_NAME_INDEX setting.
         """
+        self._use_name_index = USE_NAME_INDEX if use_name_index is None else use_name_index
+        self._name_index: Optional[SanctionsNameIndex] = None
+        self._index_lock = threading.Lock()
+        self._regime_stats: Optional[Dict[str, int]] = None
+        
         if cosmos_client:
             self._client = cosmos_client
         else:
@@ -86,6 +117,11 @@ class SanctionsReferenceService:
         Returns:
             List of matching sanctioned entities
         """
+        if self._use_name_index:
+            index = self._get_name_index()
+            if index is not None:
+                return index.search(name, max_results=max_results, entity_type=entity_type)
+        
         name_lower = name.lower().strip()
         
         # Build query
@@ -138,6 +174,11 @@ class SanctionsReferenceService:
         Returns:
             List of matching sanctioned entities
         """
+        if self._use_name_index:
+            index = self._get_name_index()
+            if index is not None:
+                return index.search_by_country(country, max_results=max_results)
+        
         country_lower = country.lower().strip()
         
         query = """
@@ -214,7 +255,8 @@ class SanctionsReferenceService:
             
         Returns:
             Dictionary with:
-            - matched: bool indicating if any matches found
+            - matched: bool indicating if any matches found (weak fuzzy
+              "possible" matches do not count)
             - matches: List of matching entities with relevance scores
             - exact_matches: Count of exact name matches
             - partial_matches: Count of partial matches
@@ -232,27 +274,35 @@ class SanctionsReferenceService:
         
         # Search for matches
         entities = self.search_by_name(name, max_results=50)
+        candidates = []
         
         for entity in entities:
             entity_name_lower = entity.name.lower()
             
             # Calculate match type
             if entity_name_lower == name_lower:
-                match_type = "exact"
-                relevance = 1.0
+                candidates.append((entity, "exact", 1.0))
                 result["exact_matches"] += 1
             elif name_lower in entity_name_lower or entity_name_lower in name_lower:
-                match_type = "strong_partial"
-                relevance = 0.8
+                candidates.append((entity, "strong_partial", 0.8))
                 result["partial_matches"] += 1
             else:
-                match_type = "partial"
-                relevance = 0.5
+                candidates.append((entity, "partial", 0.5))
                 result["partial_matches"] += 1
-            
+        
+        # Add fuzzy matches (spelling variants, reordered words) from the index
+        index = self._get_name_index() if self._use_name_index else None
+        if index is not None:
+            seen = {(entity.unique_id, entity.name) for entity in entities}
+            for entity, score in index.fuzzy_search(name, max_results=50, strict=strict_match):
+                if (entity.unique_id, entity.name) in seen:
+                    continue
+                candidates.append((entity, "fuzzy", round(score / 100 * 0.9, 2)))
+        
+        country_lower = country.lower() if country else None
+        for entity, match_type, relevance in candidates:
             # Boost relevance if country matches
-            if country:
-                country_lower = country.lower()
+            if country_lower:
                 if country_lower in entity.nationality.lower() or \
                    country_lower in entity.address_country.lower():
                     relevance = min(1.0, relevance + 0.2)
@@ -261,6 +311,12 @@ class SanctionsReferenceService:
             if strict_match and relevance < 0.8:
                 continue
             
+            if match_type == "fuzzy":
+                if relevance < FUZZY_MATCH_RELEVANCE:
+                    match_type = "possible"
+                else:
+                    result["partial_matches"] += 1
+            
             result["matches"].append({
                 "entity": {
                     "unique_id": entity.unique_id,
@@ -277,7 +333,7 @@ class SanctionsReferenceService:
         
         # Sort by relevance
         result["matches"].sort(key=lambda x: x["relevance"], reverse=True)
-        result["matched"] = len(result["matches"]) > 0
+        result["matched"] = any(m["match_type"] != "possible" for m in result["matches"])
         
         return result
     
@@ -304,9 +360,21 @@ class SanctionsReferenceService:
         """
         Get count of sanctioned entities per regime.
         
+        The list is static for the life of the service, so the counts are
+        computed once (from the name index when enabled) and copied out.
+        
         Returns:
             Dictionary mapping regime codes to entity counts
         """
+        if self._regime_stats is not None:
+            return dict(self._regime_stats)
+        
+        if self._use_name_index:
+            index = self._get_name_index()
+            if index is not None:
+                self._regime_stats = dict(index.regime_counts)
+                return dict(self._regime_stats)
+        
         query = """
             SELECT c.regimeCode, COUNT(1) as count 
             FROM c 
@@ -318,11 +386,40 @@ class SanctionsReferenceService:
                 query=query,
                 enable_cross_partition_query=True
             ))
-            return {item['regimeCode']: item['count'] for item in items}
+            self._regime_stats = {item['regimeCode']: item['count'] for item in items}
+            return dict(self._regime_stats)
         except Exception as e:
             logger.error(f"Error getting regime statistics: {e}")
             return {}
     
+    def _get_name_index(self) -> Optional[SanctionsNameIndex]:
+        """Load the full list and build the name index on first use."""
+        if self._name_index is None:
+            with self._index_lock:
+                if self._name_index is None and self._use_name_index:
+                    try:
+                        items = self._container.query_items(
+                            query="SELECT * FROM c",
+                            enable_cross_partition_query=True
+                        )
+                        self._name_index = SanctionsNameIndex(
+                            [self._doc_to_entity(self._intern_categories(item)) for item in items]
+                        )
+                        logger.info(f"Built sanctions name index ({len(self._name_index)} entries)")
+                    except Exception as e:
+                        logger.error(f"Error building sanctions name index, using CosmosDB queries: {e}")
+                        self._use_name_index = False
+        return self._name_index
+    
+    @staticmethod
+    def _intern_categories(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Intern the low-cardinality string fields of a document in place."""
+        for key in _CATEGORY_FIELDS:
+            value = doc.get(key)
+            if isinstance(value, str):
+                doc[key] = sys.intern(value)
+        return doc
+    
     def _doc_to_entity(self, doc: Dict[str, Any]) -> SanctionedEntity:
         """Convert a CosmosDB document to a SanctionedEntity"""
         return SanctionedEntity(
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Sanctions Screening Check
+
+Screens a set of known-clean company names against the bundled UK
+sanctions list using SanctionsReferenceService.check_entity with the
+in-memory name index (no CosmosDB needed), and fails if any of them is
+reported as matched. Listed names and spelling variants of them are
+screened as a control and must still match.
+
+Usage:
+    python scripts/check_sanctions_screening.py [NAME ...]
+"""
+
+import csv
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services.sanctions_reference import SanctionsReferenceService
+
+SANCTIONS_CSV = os.path.join(
+    os.path.dirname(__file__),
+    '..',
+    'StaticDataForAgents',
+    'UK-Sanctions-List.csv'
+)
+SAMPLES_FILE = os.path.join(os.path.dirname(__file__), '..', 'agents', 'samples.json')
+
+# Clean names seen reported as fuzzy matches before legal forms were ignored
+CLEAN_NAMES = [
+    "Shenzhen Electronics Co., Ltd.",
+    "UK Import Ltd.",
+    "Acme Manufacturing GmbH",
+]
+
+# Listed names and spelling variants that must still be matched
+LISTED_NAMES = [
+    "Parto Sanaat Co.",
+    "Parto Sanat Company",
+    "Haji Khairulah Haji Satar Money Exchange",
+    "Vladimir Vladimirovich Putn",
+]
+
+# Sample declaration fields holding party names
+_PARTY_FIELDS = ('shipper', 'consignee', 'exporter', 'importer', 'manufacturer')
+
+
+class _CsvContainer:
+    """Stands in for the CosmosDB container, serving documents built from the CSV."""
+    
+    def __init__(self, documents):
+        self._documents = documents
+    
+    def get_database_client(self, name):
+        return self
+    
+    def get_container_client(self, name):
+        return self
+    
+    def query_items(self, query, **kwargs):
+        return iter(self._documents)
+
+
+def load_documents(path: str = SANCTIONS_CSV) -> list:
+    """Read the sanctions CSV into documents shaped like the CosmosDB items."""
+    documents = []
+    with open(path, 'r', encoding='utf-8') as f:
+        # Skip the report date line if present
+        if f.readline().startswith('Last Updated'):
+            f.seek(0)
+        
+        for row in csv.DictReader(f):
+            name = ' '.join(part for part in (row.get(f'Name {i}', '').strip() for i in range(1, 7)) if part)
+            if not row.get('Unique ID') or not name:
+                continue
+            documents.append({
+                'uniqueId': row['Unique ID'],
+                'name': name,
+                'entityType': row.get('Designation Type', ''),
+                'regimeName': row.get('Regime Name', ''),
+                'sanctionsImposed': row.get('Sanctions Imposed', ''),
+                'nationality': row.get('Nationality(/ies)', ''),
+                'addressCountry': row.get('Address Country', ''),
+                'designationType': row.get('Designation Type', ''),
+                'ofsiGroupId': row.get('OFSI Group ID', ''),
+                'dateDesignated': row.get('Date Designated', ''),
+            })
+    return documents
+
+
+def sample_party_names(path: str = SAMPLES_FILE) -> set:
+    """Collect the shipper/consignee names used by the sample declarations."""
+    with open(path, 'r', encoding='utf-8') as f:
+        samples = json.load(f)
+    
+    names = set()
+    stack = [samples]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if key in _PARTY_FIELDS:
+                    party = value.get('name') if isinstance(value, dict) else value
+                    if isinstance(party, str) and party:
+                        names.add(party)
+                else:
+                    stack.append(value)
+        elif isinstance(item, list):
+            stack.extend(item)
+    return names
+
+
+def main() -> int:
+    documents = load_documents()
+    service = SanctionsReferenceService(cosmos_client=_CsvContainer(documents), use_name_index=True)
+    print(f"Loaded {len(documents):,} sanctions entries")
+    
+    clean = sys.argv[1:] or sorted(set(CLEAN_NAMES) | sample_party_names())
+    failures = 0
+    
+    for name in clean:
+        result = service.check_entity(name)
+        status = "MATCHED" if result["matched"] else "clear"
+        print(f"  {status:8} {name}")
+        if result["matched"]:
+            failures += 1
+            for match in result["matches"][:3]:
+                print(f"           {match['match_type']} {match['relevance']}: {match['entity']['name']}")
+    
+    if not sys.argv[1:]:
+        for name in LISTED_NAMES:
+            result = service.check_entity(name)
+            status = "matched" if result["matched"] else "MISSED"
+            print(f"  {status:8} {name} (listed)")
+            if not result["matched"]:
+                failures += 1
+    
+    print("✓ Screening check passed" if not failures else f"❌ {failures} screening check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -646,6 +646,13 @@ if [ -d "$TEMPLATES_DIR" ]; then
     done
     echo ""
     log_success "Agent YAML files generated with connection IDs"
+    
+    # Pre-parse the YAML into JSON sidecars for faster agent config loading
+    if python "$PROJECT_DIR/scripts/yaml2json.py" "$AGENTS_DIR"/*.yaml > /dev/null; then
+        log_success "Agent JSON sidecars written"
+    else
+        log_warning "Could not write agent JSON sidecars (YAML will be parsed at runtime)"
+    fi
 else
     log_warning "Templates directory not found: $TEMPLATES_DIR"
 fi
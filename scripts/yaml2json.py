@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Agent YAML to JSON Sidecars
+
+Writes a <file>.yaml.json next to each agent YAML file. The workflow loads
+a sidecar that is at least as new as its YAML instead of parsing the YAML.
+
+Usage:
+    python scripts/yaml2json.py [agents/*.yaml ...]
+"""
+
+import glob
+import json
+import os
+import sys
+
+import yaml
+
+AGENTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'agents')
+
+
+def convert(yaml_path: str) -> str:
+    """Write the JSON sidecar for one YAML file and return its path."""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(yaml_path, 'rb') as f:
+        data = yaml.load(f, Loader=loader) or {}
+    
+    json_path = yaml_path + '.json'
+    tmp_path = f"{json_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, json_path)
+    return json_path
+
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(AGENTS_DIR, '*.yaml')))
+    for path in paths:
+        print(f"  → {convert(path)}")
+
+
+if __name__ == '__main__':
+    main()